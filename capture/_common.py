@@ -0,0 +1,271 @@
+"""
+Shared capture machinery for the SDR collector scripts.
+
+Holds the raw_messages database wrapper and the UDP receive loop used by
+ais-catcher.py and rtl-ais.py, so capture-path changes land in one place.
+"""
+
+import select
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_DB = Path(__file__).parent / "ais-data.db"
+DEFAULT_PORT = 10110
+BATCH_SIZE = 64        # Max sentences per INSERT transaction
+FLUSH_INTERVAL = 0.1   # Max seconds a sentence waits before being committed
+RECV_BATCH = 32        # Max datagrams drained per socket wakeup
+RECV_BUFSIZE = 4096
+AIS_PREFIXES = (b"!AIVDM", b"!AIVDO")
+STATUS_INTERVAL = 1.0  # Seconds between status line updates
+CHECKPOINT_EVERY = 60  # Status ticks between WAL truncations
+
+
+class AISDatabase:
+    """
+    SQLite database for raw AIS messages.
+
+    Each thread gets its own connection, so no Python-side lock is needed;
+    SQLite's WAL file lock already serializes writers. Only the UDP thread
+    writes during normal operation.
+    """
+
+    _insert_sql = "INSERT INTO raw_messages (timestamp, nmea) VALUES (?, ?)"
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.local = threading.local()
+
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS raw_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                nmea BLOB NOT NULL
+            )
+        """)
+        # Rows arrive in timestamp order, so id order already serves time-range
+        # scans; a secondary timestamp index would only add a B-tree write per row
+        conn.execute("DROP INDEX IF EXISTS idx_timestamp")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path))
+            # Only applies when this connection creates the database, so it
+            # must precede the WAL switch. Lets migrate.py --vacuum return
+            # the space of dropped decoded tables without a full VACUUM.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")     # Wait out decoder/web locks
+            conn.execute("PRAGMA cache_size=-65536")      # 64 MB page cache
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")    # 256 MB
+            conn.execute("PRAGMA wal_autocheckpoint=10000")
+            conn.execute("PRAGMA journal_size_limit=67108864")  # 64 MB
+            self.local.conn = conn
+        return conn
+
+    def store_many(self, rows: list[tuple[str, bytes]]) -> int:
+        """Insert (timestamp, nmea) rows in a single transaction."""
+        conn = self._conn()
+        with conn:
+            return conn.executemany(self._insert_sql, rows).rowcount
+
+    def count(self) -> int:
+        """Rows ever stored, read from the AUTOINCREMENT counter (O(1), no table scan)."""
+        row = self._conn().execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'raw_messages'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def checkpoint(self):
+        """Checkpoint the WAL into the database and truncate it."""
+        self._conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """Close the calling thread's connection."""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            return
+        try:
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+        conn.close()
+        self.local.conn = None
+
+
+class UDPCollector:
+    """
+    Manages an SDR decoder process and the UDP listener it sends NMEA to.
+
+    Subclasses implement `command()` to build the decoder's argument list;
+    receiving, batching and storage live here.
+    """
+
+    def __init__(self, db: AISDatabase, port: int = DEFAULT_PORT):
+        self.db = db
+        self.port = port
+        self.process: Optional[subprocess.Popen] = None
+        self.socket: Optional[socket.socket] = None
+        self.running = False
+        self.count = 0
+        self.start_ns: Optional[int] = None
+        self.pending: list[tuple[str, bytes]] = []
+        self.last_flush = 0.0
+        self.recv_bufs = [memoryview(bytearray(RECV_BUFSIZE)) for _ in range(RECV_BATCH)]
+
+    def start(self):
+        # Start UDP listener first
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(("127.0.0.1", self.port))
+        self.socket.setblocking(False)
+
+        cmd = self.command()
+
+        print(f"Starting: {' '.join(cmd)}")
+        print(f"Listening on UDP port {self.port}")
+        print(f"Database: {self.db.db_path}")
+        print("-" * 50)
+
+        # The decoder inherits our stdout/stderr; NMEA arrives over UDP only
+        self.process = subprocess.Popen(cmd)
+
+        self.running = True
+        self.start_ns = time.monotonic_ns()
+        self.last_flush = time.monotonic()
+
+        # Thread to print the status line and keep the WAL bounded,
+        # independent of message rate
+        def print_status():
+            ticks = 0
+            while self.running:
+                time.sleep(STATUS_INTERVAL)
+                if not self.running:
+                    break
+                self._status()
+                ticks += 1
+                if ticks % CHECKPOINT_EVERY == 0:
+                    try:
+                        self.db.checkpoint()
+                    except sqlite3.Error as e:
+                        print(f"\nCheckpoint error: {e}")
+            self.db.close()
+
+        status_thread = threading.Thread(target=print_status, daemon=True)
+        status_thread.start()
+
+        # Main loop: wait for UDP data, then drain everything queued
+        try:
+            while self.running:
+                try:
+                    ready, _, _ = select.select([self.socket], [], [], FLUSH_INTERVAL)
+                    if not ready:
+                        self._flush()
+                        continue
+
+                    for datagram in self._drain():
+                        timestamp = None
+
+                        # Sentences stay as bytes all the way into the BLOB column
+                        for line in datagram.tobytes().split(b"\n"):
+                            line = line.strip()
+                            if line.startswith(AIS_PREFIXES):
+                                # Receive time, formatted once per datagram outside the DB lock
+                                if timestamp is None:
+                                    timestamp = datetime.now(timezone.utc).isoformat()
+                                self.pending.append((timestamp, line))
+
+                    if (len(self.pending) >= BATCH_SIZE
+                            or time.monotonic() - self.last_flush >= FLUSH_INTERVAL):
+                        self._flush()
+
+                except Exception as e:
+                    if self.running:
+                        print(f"UDP error: {e}")
+
+        except KeyboardInterrupt:
+            pass
+
+        self.stop()
+
+    def command(self) -> list[str]:
+        """Return the decoder command line, sending UDP to 127.0.0.1:self.port."""
+        raise NotImplementedError
+
+    def _drain(self) -> list[memoryview]:
+        """Read queued datagrams into the reusable buffers until the socket would block."""
+        received = []
+        for buf in self.recv_bufs:
+            try:
+                nbytes = self.socket.recv_into(buf)
+            except BlockingIOError:
+                break
+            received.append(buf[:nbytes])
+        return received
+
+    def _flush(self):
+        """Commit pending sentences to the database in one transaction."""
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+        # Cleared only once written: if the write fails (database locked past
+        # busy_timeout, disk full) the next flush retries the same rows
+        self.db.store_many(self.pending)
+        self.count += len(self.pending)
+        self.pending = []
+
+    def _status(self):
+        elapsed = (time.monotonic_ns() - self.start_ns) / 1e9
+        rate = self.count / elapsed * 60 if elapsed > 0 else 0
+        print(f"\r[{time.strftime('%H:%M:%S')}] Messages: {self.count} ({rate:.1f}/min)", end="", flush=True)
+
+    def stop(self):
+        self.running = False
+        self._flush()
+        if self.socket:
+            self.socket.close()
+        if self.process:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+        elapsed = (time.monotonic_ns() - self.start_ns) / 1e9 if self.start_ns else 0
+        print(f"\n\nStopped. {self.count} messages in {elapsed:.0f}s. Total in DB: {self.db.count()}")
+
+
+def run_collector(collector: UDPCollector):
+    """Run a collector until interrupted, closing its database on exit."""
+
+    def shutdown(sig, frame):
+        if collector.start_ns is not None:
+            # Only stop the receive loop; it does the final flush and stop()
+            # itself, so a write in progress is never flushed a second time
+            collector.running = False
+            return
+        collector.stop()
+        collector.db.close()
+        sys.exit(0)
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    try:
+        collector.start()
+    finally:
+        collector.db.close()
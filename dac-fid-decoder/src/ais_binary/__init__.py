@@ -20,7 +20,7 @@ Usage:
 from __future__ import annotations
 from typing import Dict, Any, Union
 
-from .bitreader import BitReader, bits_from_ais_payload
+from .bitreader import BitLayout, BitReader, bits_from_ais_payload
 from .dac001 import decode_dac001
 from .dac200 import decode_dac200
 from .dac367 import decode_dac367
@@ -30,6 +30,7 @@ __version__ = "0.1.0"
 __all__ = [
     "decode_binary_payload",
     "BitReader",
+    "BitLayout",
     "bits_from_ais_payload",
 ]
 
@@ -79,9 +80,6 @@ def decode_binary_payload(
     if not data:
         return {"error": "Empty payload", "dac": dac, "fid": fid}
     
-    # Add common metadata
-    result = {"dac": dac, "fid": fid}
-    
     # Dispatch to appropriate DAC decoder
     try:
         if dac == 1:
@@ -112,8 +110,8 @@ def decode_binary_payload(
             "raw": data.hex(),
         }
     
-    result.update(decoded)
-    return result
+    # Common metadata first, then the decoder's fields (one dict display)
+    return {"dac": dac, "fid": fid, **decoded}
 
 
 def decode_msg6(msg: Dict[str, Any]) -> Dict[str, Any]:
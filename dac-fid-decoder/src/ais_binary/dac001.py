@@ -11,8 +11,9 @@ References:
 """
 
 from __future__ import annotations
-from typing import Dict, Any, List, Optional
-from .bitreader import BitReader
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Optional
+from .bitreader import TEXT, BitLayout, read_string, read_uint
 
 
 def decode_dac001(fid: int, data: bytes) -> Dict[str, Any]:
@@ -26,29 +27,63 @@ def decode_dac001(fid: int, data: bytes) -> Dict[str, Any]:
     Returns:
         Decoded message fields as a dictionary
     """
-    decoders = {
-        11: decode_001_11,  # Met/Hydro (IMO 236) - deprecated
-        13: decode_001_13,  # Fairway Closed
-        15: decode_001_15,  # Extended Ship Static (Air Draught)
-        16: decode_001_16,  # Number of Persons on Board
-        17: decode_001_17,  # VTS Generated Targets
-        19: decode_001_19,  # Marine Traffic Signal
-        21: decode_001_21,  # Weather Observation Report
-        22: decode_001_22,  # Area Notice
-        24: decode_001_24,  # Extended Ship Static and Voyage
-        27: decode_001_27,  # Route Information
-        29: decode_001_29,  # Text Description
-        31: decode_001_31,  # Met/Hydro (IMO 289)
-    }
-    
-    decoder = decoders.get(fid)
-    if decoder is None:
+    entry = _DAC001_TABLE[fid] if 0 <= fid < len(_DAC001_TABLE) else None
+    if entry is None:
         return {"error": f"Unknown DAC 001 FID {fid}", "raw": data.hex()}
     
-    try:
-        return decoder(data)
-    except Exception as e:
-        return {"error": str(e), "fid": fid, "raw": data.hex()}
+    # Reject short payloads up front rather than raising mid-decode
+    decoder, min_bytes = entry
+    if len(data) < min_bytes:
+        return {
+            "error": f"DAC 001 FID {fid} needs {min_bytes} bytes, got {len(data)}",
+            "raw": data.hex(),
+        }
+    
+    # Remaining decode errors propagate to decode_binary_payload, which reports them
+    return decoder(data)
+
+
+# FID 11 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_001_11 = BitLayout([
+    # Position is in reverse order for this message type!
+    ("latitude", 0, 24, True, "x / 60000.0"),
+    ("longitude", 24, 25, True, "x / 60000.0"),
+    ("day", 49, 5, False),
+    ("hour", 54, 5, False),
+    ("minute", 59, 6, False),
+    ("wind_ave_kts", 65, 7, False),
+    ("wind_gust_kts", 72, 7, False),
+    ("wind_dir", 79, 9, False),
+    ("wind_gust_dir", 88, 9, False),
+    ("air_temp_c", 97, 11, False, "x / 10.0 - 60"),
+    ("rel_humidity_pct", 108, 7, False),
+    ("dew_point_c", 115, 10, False, "x / 10.0 - 20"),
+    ("air_pressure_hpa", 125, 9, False, "x + 800"),
+    ("air_pressure_trend", 134, 2, False),
+    ("horz_visibility_nm", 136, 8, False, "x / 10.0"),
+    ("water_level_m", 144, 9, False, "x / 10.0 - 10"),
+    ("water_level_trend", 153, 2, False),
+    ("surf_cur_speed_kts", 155, 8, False, "x / 10.0"),
+    ("surf_cur_dir", 163, 9, False),
+    ("cur_speed_2_kts", 172, 8, False, "x / 10.0"),
+    ("cur_dir_2", 180, 9, False),
+    ("cur_depth_2_m", 189, 5, False),
+    ("cur_speed_3_kts", 194, 8, False, "x / 10.0"),
+    ("cur_dir_3", 202, 9, False),
+    ("cur_depth_3_m", 211, 5, False),
+    ("wave_height_m", 216, 8, False, "x / 10.0"),
+    ("wave_period_s", 224, 6, False),
+    ("wave_dir", 230, 9, False),
+    ("swell_height_m", 239, 8, False, "x / 10.0"),
+    ("swell_period_s", 247, 6, False),
+    ("swell_dir", 253, 9, False),
+    ("sea_state_beaufort", 262, 4, False),
+    ("water_temp_c", 266, 10, False, "x / 10.0 - 10"),
+    ("precip_type", 276, 3, False),
+    ("salinity_ppt", 279, 9, False, "x / 10.0"),
+    ("ice", 288, 2, False),
+])
+_DECODE_001_11 = _LAYOUT_001_11.decoder(fid=11, description="Met/Hydro (IMO 236, deprecated)")
 
 
 def decode_001_11(data: bytes) -> Dict[str, Any]:
@@ -56,56 +91,30 @@ def decode_001_11(data: bytes) -> Dict[str, Any]:
     FID 11: Meteorological and Hydrological Data (IMO 236).
     
     DEPRECATED - superseded by FID 31 (IMO 289), but still transmitted.
-    Fixed length: 352 bits (from bit 56 of full message)
+    Fixed length: 352 bits (from bit 56)
     
     Note: This message uses REVERSE lat/lon order (lat first, then lon).
     """
-    bits = BitReader(data)
-    
-    # Position is in reverse order for this message type!
-    lat = bits.get_int(0, 24) / 60000.0
-    lon = bits.get_int(24, 25) / 60000.0
-    
-    return {
-        "fid": 11,
-        "description": "Met/Hydro (IMO 236, deprecated)",
-        "latitude": lat,
-        "longitude": lon,
-        "day": bits.get_uint(49, 5),
-        "hour": bits.get_uint(54, 5),
-        "minute": bits.get_uint(59, 6),
-        "wind_ave_kts": bits.get_uint(65, 7),
-        "wind_gust_kts": bits.get_uint(72, 7),
-        "wind_dir": bits.get_uint(79, 9),
-        "wind_gust_dir": bits.get_uint(88, 9),
-        "air_temp_c": bits.get_uint(97, 11) / 10.0 - 60,
-        "rel_humidity_pct": bits.get_uint(108, 7),
-        "dew_point_c": bits.get_uint(115, 10) / 10.0 - 20,
-        "air_pressure_hpa": bits.get_uint(125, 9) + 800,
-        "air_pressure_trend": bits.get_uint(134, 2),
-        "horz_visibility_nm": bits.get_uint(136, 8) / 10.0,
-        "water_level_m": bits.get_uint(144, 9) / 10.0 - 10,
-        "water_level_trend": bits.get_uint(153, 2),
-        "surf_cur_speed_kts": bits.get_uint(155, 8) / 10.0,
-        "surf_cur_dir": bits.get_uint(163, 9),
-        "cur_speed_2_kts": bits.get_uint(172, 8) / 10.0,
-        "cur_dir_2": bits.get_uint(180, 9),
-        "cur_depth_2_m": bits.get_uint(189, 5),
-        "cur_speed_3_kts": bits.get_uint(194, 8) / 10.0,
-        "cur_dir_3": bits.get_uint(202, 9),
-        "cur_depth_3_m": bits.get_uint(211, 5),
-        "wave_height_m": bits.get_uint(216, 8) / 10.0,
-        "wave_period_s": bits.get_uint(224, 6),
-        "wave_dir": bits.get_uint(230, 9),
-        "swell_height_m": bits.get_uint(239, 8) / 10.0,
-        "swell_period_s": bits.get_uint(247, 6),
-        "swell_dir": bits.get_uint(253, 9),
-        "sea_state_beaufort": bits.get_uint(262, 4),
-        "water_temp_c": bits.get_uint(266, 10) / 10.0 - 10,
-        "precip_type": bits.get_uint(276, 3),
-        "salinity_ppt": bits.get_uint(279, 9) / 10.0,
-        "ice": bits.get_uint(288, 2),
-    }
+    return _DECODE_001_11(data)
+
+
+# FID 13 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_001_13 = BitLayout([
+    ("reason", 0, 120, False, TEXT),
+    ("location_from", 120, 120, False, TEXT),
+    ("location_to", 240, 120, False, TEXT),
+    ("radius", 360, 10, False),
+    ("units", 370, 2, False),  # 0=km, 1=nm, 2=m
+    ("day_from", 372, 5, False),
+    ("month_from", 377, 4, False),
+    ("hour_from", 381, 5, False),
+    ("minute_from", 386, 6, False),
+    ("day_to", 392, 5, False),
+    ("month_to", 397, 4, False),
+    ("hour_to", 401, 5, False),
+    ("minute_to", 406, 6, False),
+])
+_DECODE_001_13 = _LAYOUT_001_13.decoder(fid=13, description="Fairway Closed")
 
 
 def decode_001_13(data: bytes) -> Dict[str, Any]:
@@ -115,25 +124,13 @@ def decode_001_13(data: bytes) -> Dict[str, Any]:
     IMO Circ 289 - Notification that a fairway is closed.
     Fixed length: 472 bits (from bit 56)
     """
-    bits = BitReader(data)
-    
-    return {
-        "fid": 13,
-        "description": "Fairway Closed",
-        "reason": bits.get_string(0, 120),
-        "location_from": bits.get_string(120, 120),
-        "location_to": bits.get_string(240, 120),
-        "radius": bits.get_uint(360, 10),
-        "units": bits.get_uint(370, 2),  # 0=km, 1=nm, 2=m
-        "day_from": bits.get_uint(372, 5),
-        "month_from": bits.get_uint(377, 4),
-        "hour_from": bits.get_uint(381, 5),
-        "minute_from": bits.get_uint(386, 6),
-        "day_to": bits.get_uint(392, 5),
-        "month_to": bits.get_uint(397, 4),
-        "hour_to": bits.get_uint(401, 5),
-        "minute_to": bits.get_uint(406, 6),
-    }
+    return _DECODE_001_13(data)
+
+
+_LAYOUT_001_15 = BitLayout([
+    ("air_draught_m", 0, 11, False, "x / 10.0"),
+])
+_DECODE_001_15 = _LAYOUT_001_15.decoder(fid=15, description="Extended Ship Static (Air Draught)")
 
 
 def decode_001_15(data: bytes) -> Dict[str, Any]:
@@ -143,13 +140,13 @@ def decode_001_15(data: bytes) -> Dict[str, Any]:
     IMO Circ 289 - Reports the height of the highest point.
     Fixed length: 72 bits (from bit 56)
     """
-    bits = BitReader(data)
-    
-    return {
-        "fid": 15,
-        "description": "Extended Ship Static (Air Draught)",
-        "air_draught_m": bits.get_uint(0, 11) / 10.0,
-    }
+    return _DECODE_001_15(data)
+
+
+_LAYOUT_001_16 = BitLayout([
+    ("persons", 0, 13, False),
+])
+_DECODE_001_16 = _LAYOUT_001_16.decoder(fid=16, description="Number of Persons on Board")
 
 
 def decode_001_16(data: bytes) -> Dict[str, Any]:
@@ -159,13 +156,21 @@ def decode_001_16(data: bytes) -> Dict[str, Any]:
     IMO Circ 289 - Reports the number of persons on board.
     Fixed length: 72 bits (from bit 56)
     """
-    bits = BitReader(data)
-    
-    return {
-        "fid": 16,
-        "description": "Number of Persons on Board",
-        "persons": bits.get_uint(0, 13),
-    }
+    return _DECODE_001_16(data)
+
+
+# FID 17 target block layout (120 bits, byte aligned): (name, offset, width, signed[, conversion])
+_LAYOUT_001_17_TARGET = BitLayout([
+    ("type", 0, 2, False),
+    ("id", 2, 42, False, TEXT),
+    # Note: lat/lon in reverse order
+    ("latitude", 48, 24, True, "x / 60000.0"),
+    ("longitude", 72, 25, True, "x / 60000.0"),
+    ("cog", 97, 9, False),
+    ("timestamp", 106, 6, False),
+    ("sog_kts", 112, 8, False),
+])
+_DECODE_001_17_TARGET = _LAYOUT_001_17_TARGET.decoder()
 
 
 def decode_001_17(data: bytes) -> Dict[str, Any]:
@@ -175,26 +180,9 @@ def decode_001_17(data: bytes) -> Dict[str, Any]:
     IMO Circ 289 - Targets detected by VTS radar but not transmitting AIS.
     Variable length: 56 + N*120 bits, where N is 1-4 targets.
     """
-    bits = BitReader(data)
-    num_bits = len(data) * 8
-    num_targets = num_bits // 120
-    
-    targets = []
-    for i in range(min(num_targets, 4)):
-        start = i * 120
-        # Note: lat/lon in reverse order
-        lat = bits.get_int(start + 48, 24) / 60000.0
-        lon = bits.get_int(start + 72, 25) / 60000.0
-        
-        targets.append({
-            "type": bits.get_uint(start, 2),
-            "id": bits.get_string(start + 2, 42),
-            "latitude": lat,
-            "longitude": lon,
-            "cog": bits.get_uint(start + 97, 9),
-            "timestamp": bits.get_uint(start + 106, 6),
-            "sog_kts": bits.get_uint(start + 112, 8),
-        })
+    # Targets are 15 bytes each; walk them by byte offset, clamped to 4
+    end = min(len(data) // 15, 4) * 15
+    targets = [_DECODE_001_17_TARGET(data[start:start + 15]) for start in range(0, end, 15)]
     
     return {
         "fid": 17,
@@ -203,6 +191,21 @@ def decode_001_17(data: bytes) -> Dict[str, Any]:
     }
 
 
+# FID 19 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_001_19 = BitLayout([
+    ("link_id", 0, 10, False),
+    ("name", 10, 120, False, TEXT),
+    ("longitude", 130, 25, True, "x / 60000.0"),
+    ("latitude", 155, 24, True, "x / 60000.0"),
+    ("status", 179, 2, False),
+    ("signal", 181, 5, False),
+    ("utc_hour_next", 186, 5, False),
+    ("utc_min_next", 191, 6, False),
+    ("next_signal", 197, 5, False),
+])
+_DECODE_001_19 = _LAYOUT_001_19.decoder(fid=19, description="Marine Traffic Signal")
+
+
 def decode_001_19(data: bytes) -> Dict[str, Any]:
     """
     FID 19: Marine Traffic Signal.
@@ -210,23 +213,76 @@ def decode_001_19(data: bytes) -> Dict[str, Any]:
     IMO Circ 289 - Traffic signal status at a waterway.
     Fixed length: 258 or 360 bits (from bit 56)
     """
-    bits = BitReader(data)
-    
-    lon, lat = bits.get_position(130)
-    
-    return {
-        "fid": 19,
-        "description": "Marine Traffic Signal",
-        "link_id": bits.get_uint(0, 10),
-        "name": bits.get_string(10, 120),
-        "longitude": lon,
-        "latitude": lat,
-        "status": bits.get_uint(179, 2),
-        "signal": bits.get_uint(181, 5),
-        "utc_hour_next": bits.get_uint(186, 5),
-        "utc_min_next": bits.get_uint(191, 6),
-        "next_signal": bits.get_uint(197, 5),
-    }
+    return _DECODE_001_19(data)
+
+
+# FID 21 type 0 (AIS) layout: (name, offset, width, signed[, conversion])
+_LAYOUT_001_21_AIS = BitLayout([
+    ("location", 1, 120, False, TEXT),
+    ("longitude", 121, 25, True, "x / 60000.0"),
+    ("latitude", 146, 24, True, "x / 60000.0"),
+    ("day", 170, 5, False),
+    ("hour", 175, 5, False),
+    ("minute", 180, 6, False),
+    ("wx_code", 186, 4, False),
+    ("horz_visibility_nm", 190, 8, False, "x / 10.0"),
+    ("humidity_pct", 198, 7, False),
+    ("wind_speed_kts", 205, 7, False),
+    ("wind_dir", 212, 9, False),
+    ("air_pressure_hpa", 221, 9, False),
+    ("air_pressure_trend", 230, 4, False),
+    ("air_temp_c", 234, 11, True, "x / 10.0"),
+    ("water_temp_c", 245, 10, False, "x / 10.0 - 10"),
+    ("wave_period_s", 255, 6, False),
+    ("wave_height_m", 261, 8, False, "x / 10.0"),
+    ("wave_dir", 269, 9, False),
+    ("swell_height_m", 278, 8, False, "x / 10.0"),
+    ("swell_dir", 286, 9, False),
+    ("swell_period_s", 295, 6, False),
+])
+_DECODE_001_21_AIS = _LAYOUT_001_21_AIS.decoder(fid=21, description="Weather Observation (AIS format)", type=0)
+
+# FID 21 type 1 (WMO) layout: (name, offset, width, signed[, conversion])
+_LAYOUT_001_21_WMO = BitLayout([
+    ("longitude", 1, 16, False, "x / 100.0 - 180"),
+    ("latitude", 17, 15, False, "x / 100.0 - 90"),
+    ("month", 32, 4, False),
+    ("day", 36, 6, False),
+    ("hour", 42, 5, False),
+    ("minute", 47, 3, False, "x * 10"),
+    ("cog", 50, 7, False, "x * 5"),
+    ("sog_kts", 57, 5, False, "x * 0.5"),
+    ("heading", 62, 7, False, "x * 5"),
+    ("pressure_hpa", 69, 11, False, "x / 10.0 + 900"),
+    ("rel_pressure_hpa", 80, 10, False, "x / 10.0 - 50"),
+    ("pressure_trend", 90, 4, False),
+    ("wind_dir", 94, 7, False, "x * 5"),
+    ("wind_speed_ms", 101, 8, False, "x * 0.5"),
+    ("wind_dir_rel", 109, 7, False, "x * 5"),
+    ("wind_speed_rel_ms", 116, 8, False, "x * 0.5"),
+    ("wind_gust_speed_ms", 124, 8, False, "x * 0.5"),
+    ("wind_gust_dir", 132, 7, False, "x * 5"),
+    ("air_temp_raw", 139, 10, False),  # Kelvin offset
+    ("humidity_pct", 149, 7, False),
+    ("water_temp_raw", 156, 9, False),
+    ("wx_current", 171, 9, False),
+    ("wx_past_1", 180, 5, False),
+    ("wx_past_2", 185, 5, False),
+    ("cloud_total_pct", 190, 4, False, "x * 10"),
+    ("cloud_low", 194, 4, False),
+    ("cloud_low_type", 198, 6, False),
+    ("cloud_middle_type", 204, 6, False),
+    ("cloud_high_type", 210, 6, False),
+    ("wave_period_s", 223, 5, False),
+    ("wave_height_m", 228, 6, False, "x * 0.5"),
+    ("swell_dir", 234, 6, False, "x * 10"),
+    ("swell_period_s", 240, 5, False),
+    ("swell_height_m", 245, 6, False, "x * 0.5"),
+    ("ice_thickness_m", 268, 7, False, "x / 100.0"),
+    ("ice_accretion", 275, 3, False),
+    ("ice_accretion_cause", 278, 3, False),
+])
+_DECODE_001_21_WMO = _LAYOUT_001_21_WMO.decoder(fid=21, description="Weather Observation (WMO format)", type=1)
 
 
 def decode_001_21(data: bytes) -> Dict[str, Any]:
@@ -236,84 +292,25 @@ def decode_001_21(data: bytes) -> Dict[str, Any]:
     IMO Circ 289 - Two formats: type 0 (AIS) or type 1 (WMO).
     Fixed length: 360 bits (from bit 56)
     """
-    bits = BitReader(data)
-    type_wx = bits.get_bool(0)
-    
-    if not type_wx:
+    if not read_uint(data, 0, 1):
         # Type 0: AIS weather observation
-        lon, lat = bits.get_position(121)
-        return {
-            "fid": 21,
-            "description": "Weather Observation (AIS format)",
-            "type": 0,
-            "location": bits.get_string(1, 120),
-            "longitude": lon,
-            "latitude": lat,
-            "day": bits.get_uint(170, 5),
-            "hour": bits.get_uint(175, 5),
-            "minute": bits.get_uint(180, 6),
-            "wx_code": bits.get_uint(186, 4),
-            "horz_visibility_nm": bits.get_uint(190, 8) / 10.0,
-            "humidity_pct": bits.get_uint(198, 7),
-            "wind_speed_kts": bits.get_uint(205, 7),
-            "wind_dir": bits.get_uint(212, 9),
-            "air_pressure_hpa": bits.get_uint(221, 9),
-            "air_pressure_trend": bits.get_uint(230, 4),
-            "air_temp_c": bits.get_int(234, 11) / 10.0,
-            "water_temp_c": bits.get_uint(245, 10) / 10.0 - 10,
-            "wave_period_s": bits.get_uint(255, 6),
-            "wave_height_m": bits.get_uint(261, 8) / 10.0,
-            "wave_dir": bits.get_uint(269, 9),
-            "swell_height_m": bits.get_uint(278, 8) / 10.0,
-            "swell_dir": bits.get_uint(286, 9),
-            "swell_period_s": bits.get_uint(295, 6),
-        }
+        return _DECODE_001_21_AIS(data)
     else:
         # Type 1: WMO weather observation
-        lon = (bits.get_uint(1, 16) / 100.0) - 180
-        lat = (bits.get_uint(17, 15) / 100.0) - 90
-        return {
-            "fid": 21,
-            "description": "Weather Observation (WMO format)",
-            "type": 1,
-            "longitude": lon,
-            "latitude": lat,
-            "month": bits.get_uint(32, 4),
-            "day": bits.get_uint(36, 6),
-            "hour": bits.get_uint(42, 5),
-            "minute": bits.get_uint(47, 3) * 10,
-            "cog": bits.get_uint(50, 7) * 5,
-            "sog_kts": bits.get_uint(57, 5) * 0.5,
-            "heading": bits.get_uint(62, 7) * 5,
-            "pressure_hpa": bits.get_uint(69, 11) / 10.0 + 900,
-            "rel_pressure_hpa": bits.get_uint(80, 10) / 10.0 - 50,
-            "pressure_trend": bits.get_uint(90, 4),
-            "wind_dir": bits.get_uint(94, 7) * 5,
-            "wind_speed_ms": bits.get_uint(101, 8) * 0.5,
-            "wind_dir_rel": bits.get_uint(109, 7) * 5,
-            "wind_speed_rel_ms": bits.get_uint(116, 8) * 0.5,
-            "wind_gust_speed_ms": bits.get_uint(124, 8) * 0.5,
-            "wind_gust_dir": bits.get_uint(132, 7) * 5,
-            "air_temp_raw": bits.get_uint(139, 10),  # Kelvin offset
-            "humidity_pct": bits.get_uint(149, 7),
-            "water_temp_raw": bits.get_uint(156, 9),
-            "wx_current": bits.get_uint(171, 9),
-            "wx_past_1": bits.get_uint(180, 5),
-            "wx_past_2": bits.get_uint(185, 5),
-            "cloud_total_pct": bits.get_uint(190, 4) * 10,
-            "cloud_low": bits.get_uint(194, 4),
-            "cloud_low_type": bits.get_uint(198, 6),
-            "cloud_middle_type": bits.get_uint(204, 6),
-            "cloud_high_type": bits.get_uint(210, 6),
-            "wave_period_s": bits.get_uint(223, 5),
-            "wave_height_m": bits.get_uint(228, 6) * 0.5,
-            "swell_dir": bits.get_uint(234, 6) * 10,
-            "swell_period_s": bits.get_uint(240, 5),
-            "swell_height_m": bits.get_uint(245, 6) * 0.5,
-            "ice_thickness_m": bits.get_uint(268, 7) / 100.0,
-            "ice_accretion": bits.get_uint(275, 3),
-            "ice_accretion_cause": bits.get_uint(278, 3),
-        }
+        return _DECODE_001_21_WMO(data)
+
+
+# FID 22 header layout: (name, offset, width, signed)
+_LAYOUT_001_22 = BitLayout([
+    ("link_id", 0, 10, False),
+    ("notice_type", 10, 7, False),
+    ("month", 17, 4, False),
+    ("day", 21, 5, False),
+    ("hour", 26, 5, False),
+    ("minute", 31, 6, False),
+    ("duration_min", 37, 18, False),
+])
+_DECODE_001_22_HEADER = _LAYOUT_001_22.decoder(fid=22, description="Area Notice")
 
 
 def decode_001_22(data: bytes) -> Dict[str, Any]:
@@ -326,35 +323,44 @@ def decode_001_22(data: bytes) -> Dict[str, Any]:
     This is a complex message type with many sub-area shapes.
     For full implementation, see ais8_1_22.cpp in libais.
     """
-    bits = BitReader(data)
-    
     # Parse header
-    result = {
-        "fid": 22,
-        "description": "Area Notice",
-        "link_id": bits.get_uint(0, 10),
-        "notice_type": bits.get_uint(10, 7),
-        "month": bits.get_uint(17, 4),
-        "day": bits.get_uint(21, 5),
-        "hour": bits.get_uint(26, 5),
-        "minute": bits.get_uint(31, 6),
-        "duration_min": bits.get_uint(37, 18),
-        "sub_areas": [],
-    }
+    result = _DECODE_001_22_HEADER(data)
+    result["sub_areas"] = []
     
-    # Sub-areas start at bit 87 (from the payload start)
+    # Sub-areas start at bit 87 (from the payload start), i.e. from byte 11
     # Each sub-area is identified by a shape type
     # This is simplified - full implementation would decode each shape
-    num_bits = len(data) * 8
-    if num_bits > 87:
-        sub_area_bits = num_bits - 87
-        num_sub_areas = sub_area_bits // 87
-        result["num_sub_areas"] = num_sub_areas
-        result["sub_area_data_hex"] = data[11:].hex()  # Raw sub-area data
+    if len(data) > 10:
+        result["num_sub_areas"] = (len(data) * 8 - 87) // 87
+        # Raw sub-area data, hex-encoded straight from a view (no slice copy)
+        result["sub_area_data_hex"] = memoryview(data)[11:].hex()
     
     return result
 
 
+# FID 24 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_001_24 = BitLayout([
+    ("link_id", 0, 10, False),
+    ("air_draught_m", 10, 13, False, "x / 10.0"),
+    ("last_port", 23, 30, False, TEXT),
+    ("next_port_1", 53, 30, False, TEXT),
+    ("next_port_2", 83, 30, False, TEXT),
+    ("solas_status", 113, 52, False),  # Split into 2-bit items below
+    ("ice_class", 165, 4, False),
+    ("shaft_power_hp", 169, 18, False),
+    ("vhf_channel", 187, 12, False),
+    ("lloyds_ship_type", 199, 42, False, TEXT),
+    ("gross_tonnage", 241, 18, False),
+    ("laden_ballast", 259, 2, False),
+    ("heavy_oil", 261, 2, False),
+    ("light_oil", 263, 2, False),
+    ("diesel", 265, 2, False),
+    ("bunker_oil_tonnes", 267, 14, False),
+    ("persons", 281, 13, False),
+])
+_DECODE_001_24 = _LAYOUT_001_24.decoder(fid=24, description="Extended Ship Static and Voyage")
+
+
 def decode_001_24(data: bytes) -> Dict[str, Any]:
     """
     FID 24: Extended Ship Static and Voyage Related Data.
@@ -362,34 +368,52 @@ def decode_001_24(data: bytes) -> Dict[str, Any]:
     IMO Circ 289 - Additional static data about the vessel.
     Fixed length: 360 bits (from bit 56)
     """
-    bits = BitReader(data)
+    result = _DECODE_001_24(data)
     
     # SOLAS equipment status (26 items, 2 bits each)
-    solas_status = []
-    for i in range(26):
-        solas_status.append(bits.get_uint(113 + i * 2, 2))
+    solas = result["solas_status"]
+    result["solas_status"] = [(solas >> shift) & 3 for shift in range(50, -1, -2)]
     
-    return {
-        "fid": 24,
-        "description": "Extended Ship Static and Voyage",
-        "link_id": bits.get_uint(0, 10),
-        "air_draught_m": bits.get_uint(10, 13) / 10.0,
-        "last_port": bits.get_string(23, 30),
-        "next_port_1": bits.get_string(53, 30),
-        "next_port_2": bits.get_string(83, 30),
-        "solas_status": solas_status,
-        "ice_class": bits.get_uint(165, 4),
-        "shaft_power_hp": bits.get_uint(169, 18),
-        "vhf_channel": bits.get_uint(187, 12),
-        "lloyds_ship_type": bits.get_string(199, 42),
-        "gross_tonnage": bits.get_uint(241, 18),
-        "laden_ballast": bits.get_uint(259, 2),
-        "heavy_oil": bits.get_uint(261, 2),
-        "light_oil": bits.get_uint(263, 2),
-        "diesel": bits.get_uint(265, 2),
-        "bunker_oil_tonnes": bits.get_uint(267, 14),
-        "persons": bits.get_uint(281, 13),
-    }
+    return result
+
+
+# FID 27 header layout: (name, offset, width, signed)
+_LAYOUT_001_27 = BitLayout([
+    ("link_id", 0, 10, False),
+    ("sender_type", 10, 3, False),
+    ("route_type", 13, 5, False),
+    ("month", 18, 4, False),
+    ("day", 22, 5, False),
+    ("hour", 27, 5, False),
+    ("minute", 32, 6, False),
+    ("duration_min", 38, 18, False),
+])
+_DECODE_001_27_HEADER = _LAYOUT_001_27.decoder(fid=27, description="Route Information")
+
+
+def _route_waypoints(data: bytes, count: int) -> List[Dict[str, float]]:
+    """
+    Extract FID 27 waypoints (28-bit lon, 27-bit lat) starting at bit 61.
+    
+    The payload is converted to an int once and each 55-bit waypoint is
+    shifted down to the bottom, so the loop body is plain int arithmetic.
+    """
+    bits = int.from_bytes(data, 'big')
+    shift = len(data) * 8 - 61
+    waypoints = []
+    
+    for _ in range(count):
+        shift -= 55
+        point = bits >> shift
+        # Two's complement sign extension without branches
+        lon = (((point >> 27) & 0xFFFFFFF) ^ 0x8000000) - 0x8000000
+        lat = ((point & 0x7FFFFFF) ^ 0x4000000) - 0x4000000
+        waypoints.append({
+            "longitude": lon / 600000.0,
+            "latitude": lat / 600000.0,
+        })
+    
+    return waypoints
 
 
 def decode_001_27(data: bytes) -> Dict[str, Any]:
@@ -399,34 +423,11 @@ def decode_001_27(data: bytes) -> Dict[str, Any]:
     IMO Circ 289 - Broadcast route with waypoints.
     Variable length: 117 + N*55 bits (N = 0-16 waypoints)
     """
-    bits = BitReader(data)
-    
-    result = {
-        "fid": 27,
-        "description": "Route Information",
-        "link_id": bits.get_uint(0, 10),
-        "sender_type": bits.get_uint(10, 3),
-        "route_type": bits.get_uint(13, 5),
-        "month": bits.get_uint(18, 4),
-        "day": bits.get_uint(22, 5),
-        "hour": bits.get_uint(27, 5),
-        "minute": bits.get_uint(32, 6),
-        "duration_min": bits.get_uint(38, 18),
-        "waypoints": [],
-    }
+    result = _DECODE_001_27_HEADER(data)
     
     # Waypoints start at bit 61 (from payload start)
-    num_bits = len(data) * 8
-    num_waypoints = (num_bits - 61) // 55
-    
-    for i in range(min(num_waypoints, 16)):
-        start = 61 + i * 55
-        lon = bits.get_int(start, 28) / 600000.0
-        lat = bits.get_int(start + 28, 27) / 600000.0
-        result["waypoints"].append({
-            "longitude": lon,
-            "latitude": lat,
-        })
+    num_waypoints = (len(data) * 8 - 61) // 55
+    result["waypoints"] = _route_waypoints(data, min(num_waypoints, 16))
     
     return result
 
@@ -438,7 +439,6 @@ def decode_001_29(data: bytes) -> Dict[str, Any]:
     IMO Circ 289 - Free-form text associated with a link ID.
     Variable length: 72-1032 bits
     """
-    bits = BitReader(data)
     num_bits = len(data) * 8
     
     # Text is 6-bit ASCII, as many characters as fit
@@ -447,11 +447,54 @@ def decode_001_29(data: bytes) -> Dict[str, Any]:
     return {
         "fid": 29,
         "description": "Text Description",
-        "link_id": bits.get_uint(0, 10),
-        "text": bits.get_string(10, text_bits),
+        "link_id": read_uint(data, 0, 10),
+        "text": read_string(data, 10, text_bits),
     }
 
 
+# FID 31 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_001_31 = BitLayout([
+    ("longitude", 0, 25, True, "x / 60000.0"),
+    ("latitude", 25, 24, True, "x / 60000.0"),
+    ("position_accuracy", 49, 1, False, "x == 1"),
+    ("day", 50, 5, False),
+    ("hour", 55, 5, False),
+    ("minute", 60, 6, False),
+    ("wind_ave_kts", 66, 7, False),
+    ("wind_gust_kts", 73, 7, False),
+    ("wind_dir", 80, 9, False),
+    ("wind_gust_dir", 89, 9, False),
+    ("air_temp_c", 98, 11, True, "x / 10.0"),
+    ("rel_humidity_pct", 109, 7, False),
+    ("dew_point_c", 116, 10, True, "x / 10.0"),
+    ("air_pressure_hpa", 126, 9, False, "(x + 800) / 100.0"),
+    ("air_pressure_trend", 135, 2, False),
+    ("horz_visibility_nm", 137, 8, False, "x / 10.0"),
+    ("water_level_m", 145, 12, False, "x / 100.0 - 10"),
+    ("water_level_trend", 157, 2, False),
+    ("surf_cur_speed_kts", 159, 8, False, "x / 10.0"),
+    ("surf_cur_dir", 167, 9, False),
+    ("cur_speed_2_kts", 176, 8, False, "x / 10.0"),
+    ("cur_dir_2", 184, 9, False),
+    ("cur_depth_2_m", 193, 5, False),
+    ("cur_speed_3_kts", 198, 8, False, "x / 10.0"),
+    ("cur_dir_3", 206, 9, False),
+    ("cur_depth_3_m", 215, 5, False),
+    ("wave_height_m", 220, 8, False, "x / 10.0"),
+    ("wave_period_s", 228, 6, False),
+    ("wave_dir", 234, 9, False),
+    ("swell_height_m", 243, 8, False, "x / 10.0"),
+    ("swell_period_s", 251, 6, False),
+    ("swell_dir", 257, 9, False),
+    ("sea_state_beaufort", 266, 4, False),
+    ("water_temp_c", 270, 10, True, "x / 10.0"),
+    ("precip_type", 280, 3, False),
+    ("salinity_ppt", 283, 9, False, "x / 10.0"),
+    ("ice", 292, 2, False),
+])
+_DECODE_001_31 = _LAYOUT_001_31.decoder(fid=31, description="Met/Hydro (IMO 289)")
+
+
 def decode_001_31(data: bytes) -> Dict[str, Any]:
     """
     FID 31: Meteorological and Hydrological Data (IMO 289).
@@ -459,48 +502,49 @@ def decode_001_31(data: bytes) -> Dict[str, Any]:
     Current standard for Met/Hydro data, replaces FID 11.
     Fixed length: 360 bits (from bit 56)
     """
-    bits = BitReader(data)
+    return _DECODE_001_31(data)
+
+
+def decode_001_11_batch(payloads: Iterable[bytes]) -> Dict[str, List[Any]]:
+    """
+    Decode many FID 11 payloads into columns (one list per field).
     
-    lon, lat = bits.get_position(0)
+    Values match decode_001_11 field for field, but the layout is applied
+    to the whole batch at once, which suits bulk backfills and analysis.
     
-    return {
-        "fid": 31,
-        "description": "Met/Hydro (IMO 289)",
-        "longitude": lon,
-        "latitude": lat,
-        "position_accuracy": bits.get_bool(49),
-        "day": bits.get_uint(50, 5),
-        "hour": bits.get_uint(55, 5),
-        "minute": bits.get_uint(60, 6),
-        "wind_ave_kts": bits.get_uint(66, 7),
-        "wind_gust_kts": bits.get_uint(73, 7),
-        "wind_dir": bits.get_uint(80, 9),
-        "wind_gust_dir": bits.get_uint(89, 9),
-        "air_temp_c": bits.get_int(98, 11) / 10.0,
-        "rel_humidity_pct": bits.get_uint(109, 7),
-        "dew_point_c": bits.get_int(116, 10) / 10.0,
-        "air_pressure_hpa": (bits.get_uint(126, 9) + 800) / 100.0,
-        "air_pressure_trend": bits.get_uint(135, 2),
-        "horz_visibility_nm": bits.get_uint(137, 8) / 10.0,
-        "water_level_m": bits.get_uint(145, 12) / 100.0 - 10,
-        "water_level_trend": bits.get_uint(157, 2),
-        "surf_cur_speed_kts": bits.get_uint(159, 8) / 10.0,
-        "surf_cur_dir": bits.get_uint(167, 9),
-        "cur_speed_2_kts": bits.get_uint(176, 8) / 10.0,
-        "cur_dir_2": bits.get_uint(184, 9),
-        "cur_depth_2_m": bits.get_uint(193, 5),
-        "cur_speed_3_kts": bits.get_uint(198, 8) / 10.0,
-        "cur_dir_3": bits.get_uint(206, 9),
-        "cur_depth_3_m": bits.get_uint(215, 5),
-        "wave_height_m": bits.get_uint(220, 8) / 10.0,
-        "wave_period_s": bits.get_uint(228, 6),
-        "wave_dir": bits.get_uint(234, 9),
-        "swell_height_m": bits.get_uint(243, 8) / 10.0,
-        "swell_period_s": bits.get_uint(251, 6),
-        "swell_dir": bits.get_uint(257, 9),
-        "sea_state_beaufort": bits.get_uint(266, 4),
-        "water_temp_c": bits.get_int(270, 10) / 10.0,
-        "precip_type": bits.get_uint(280, 3),
-        "salinity_ppt": bits.get_uint(283, 9) / 10.0,
-        "ice": bits.get_uint(292, 2),
-    }
+    Raises:
+        ValueError: If any payload is too short
+    """
+    return _LAYOUT_001_11.unpack_columns(payloads)
+
+
+def decode_001_31_batch(payloads: Iterable[bytes]) -> Dict[str, List[Any]]:
+    """
+    Decode many FID 31 payloads into columns (one list per field).
+    
+    See decode_001_11_batch.
+    
+    Raises:
+        ValueError: If any payload is too short
+    """
+    return _LAYOUT_001_31.unpack_columns(payloads)
+
+
+# FID -> (decoder, minimum payload bytes), flattened into a tuple indexed by
+# FID so dispatch is a bounds check and a subscript (defined last, after the
+# decoders it names)
+_DECODERS = MappingProxyType({
+    11: (decode_001_11, _LAYOUT_001_11.num_bytes),  # Met/Hydro (IMO 236) - deprecated
+    13: (decode_001_13, _LAYOUT_001_13.num_bytes),  # Fairway Closed
+    15: (decode_001_15, _LAYOUT_001_15.num_bytes),  # Extended Ship Static (Air Draught)
+    16: (decode_001_16, _LAYOUT_001_16.num_bytes),  # Number of Persons on Board
+    17: (decode_001_17, 1),  # VTS Generated Targets
+    19: (decode_001_19, _LAYOUT_001_19.num_bytes),  # Marine Traffic Signal
+    21: (decode_001_21, min(_LAYOUT_001_21_AIS.num_bytes, _LAYOUT_001_21_WMO.num_bytes)),  # Weather Observation Report
+    22: (decode_001_22, _LAYOUT_001_22.num_bytes),  # Area Notice
+    24: (decode_001_24, _LAYOUT_001_24.num_bytes),  # Extended Ship Static and Voyage
+    27: (decode_001_27, _LAYOUT_001_27.num_bytes),  # Route Information
+    29: (decode_001_29, 2),  # Text Description
+    31: (decode_001_31, _LAYOUT_001_31.num_bytes),  # Met/Hydro (IMO 289)
+})
+_DAC001_TABLE = tuple(_DECODERS.get(fid) for fid in range(max(_DECODERS) + 1))
@@ -11,8 +11,9 @@ References:
 """
 
 from __future__ import annotations
+from types import MappingProxyType
 from typing import Dict, Any
-from .bitreader import BitReader
+from .bitreader import TEXT, BitLayout
 
 
 # Ship type codes for inland vessels
@@ -78,29 +79,45 @@ INLAND_SHIP_TYPES = {
     8510: "Object, not otherwise specified",
 }
 
+# INLAND_SHIP_TYPES as a tuple indexed by (code - 8000); unassigned codes are None
+_INLAND_SHIP_TYPE_LUT = tuple(
+    INLAND_SHIP_TYPES.get(code) for code in range(8000, max(INLAND_SHIP_TYPES) + 1)
+)
+
 
 def decode_dac200(fid: int, data: bytes) -> Dict[str, Any]:
     """
     Dispatch to the appropriate DAC 200 FID decoder.
     """
-    decoders = {
-        10: decode_200_10,  # Inland ship static and voyage
-        21: decode_200_21,  # ETA at lock/bridge/terminal
-        22: decode_200_22,  # RTA at lock/bridge/terminal
-        23: decode_200_23,  # EMMA warning
-        24: decode_200_24,  # Water levels
-        40: decode_200_40,  # Signal status
-        55: decode_200_55,  # Number of persons on board
-    }
-    
-    decoder = decoders.get(fid)
-    if decoder is None:
+    entry = _DAC200_TABLE[fid] if 0 <= fid < len(_DAC200_TABLE) else None
+    if entry is None:
         return {"error": f"Unknown DAC 200 FID {fid}", "raw": data.hex()}
     
-    try:
-        return decoder(data)
-    except Exception as e:
-        return {"error": str(e), "fid": fid, "raw": data.hex()}
+    # Reject short payloads up front rather than raising mid-decode
+    decoder, min_bytes = entry
+    if len(data) < min_bytes:
+        return {
+            "error": f"DAC 200 FID {fid} needs {min_bytes} bytes, got {len(data)}",
+            "raw": data.hex(),
+        }
+    
+    # Remaining decode errors propagate to decode_binary_payload, which reports them
+    return decoder(data)
+
+
+# FID 10 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_200_10 = BitLayout([
+    ("eni", 0, 48, False, TEXT),  # European Number of Identification
+    ("length_m", 48, 13, False, "x / 10.0"),
+    ("beam_m", 61, 10, False, "x / 10.0"),
+    ("ship_type", 48, 14, False),
+    ("hazard", 88, 3, False),
+    ("draught_cm", 91, 11, False),
+    ("loaded", 102, 2, False),
+    ("speed_quality", 104, 1, False, "x == 1"),
+    ("course_quality", 105, 1, False, "x == 1"),
+    ("heading_quality", 106, 1, False, "x == 1"),
+])
 
 
 def decode_200_10(data: bytes) -> Dict[str, Any]:
@@ -110,28 +127,54 @@ def decode_200_10(data: bytes) -> Dict[str, Any]:
     Extended vessel information for inland waterways.
     Fixed length: 168 bits
     """
-    bits = BitReader(data)
+    (eni, length_m, beam_m, ship_type, hazard, draught_cm, loaded,
+     speed_quality, course_quality, heading_quality) = _LAYOUT_200_10.unpack(data)
     
-    ship_type = bits.get_uint(48, 14)
-    ship_type_text = INLAND_SHIP_TYPES.get(ship_type, f"Unknown ({ship_type})")
+    index = ship_type - 8000
+    ship_type_text = (
+        _INLAND_SHIP_TYPE_LUT[index] if 0 <= index < len(_INLAND_SHIP_TYPE_LUT) else None
+    )
+    if ship_type_text is None:
+        ship_type_text = f"Unknown ({ship_type})"
     
     return {
         "fid": 10,
         "description": "Inland Ship Static and Voyage",
-        "eni": bits.get_string(0, 48),  # European Number of Identification
-        "length_m": bits.get_uint(48, 13) / 10.0,
-        "beam_m": bits.get_uint(61, 10) / 10.0,
+        "eni": eni,
+        "length_m": length_m,
+        "beam_m": beam_m,
         "ship_type": ship_type,
         "ship_type_text": ship_type_text,
-        "hazard": bits.get_uint(88, 3),  # Blue cones/lights
-        "draught_cm": bits.get_uint(91, 11),
-        "loaded": bits.get_uint(102, 2),  # 0=N/A, 1=unloaded, 2=loaded
-        "speed_quality": bits.get_bool(104),
-        "course_quality": bits.get_bool(105),
-        "heading_quality": bits.get_bool(106),
+        "hazard": hazard,  # Blue cones/lights
+        "draught_cm": draught_cm,
+        "loaded": loaded,  # 0=N/A, 1=unloaded, 2=loaded
+        "speed_quality": speed_quality,
+        "course_quality": course_quality,
+        "heading_quality": heading_quality,
     }
 
 
+# FID 21 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_200_21 = BitLayout([
+    ("country", 0, 12, False, TEXT),  # UN country code
+    ("location", 12, 18, False, TEXT),  # UN location code
+    ("section", 30, 30, False, TEXT),
+    ("terminal", 60, 30, False, TEXT),
+    ("fairway_section", 90, 30, False, TEXT),
+    ("fairway_hectometre", 120, 30, False, TEXT),
+    ("eta_month", 150, 4, False),
+    ("eta_day", 154, 5, False),
+    ("eta_hour", 159, 5, False),
+    ("eta_minute", 164, 6, False),
+    ("convoy_count", 170, 3, False),
+    ("convoy_length_m", 173, 13, False, "x / 10.0"),
+    ("convoy_beam_m", 186, 10, False, "x / 10.0"),
+    ("convoy_draught_cm", 196, 11, False),
+    ("direction", 207, 1, False),  # 0=downstream, 1=upstream
+])
+_DECODE_200_21 = _LAYOUT_200_21.decoder(fid=21, description="ETA at Lock/Bridge/Terminal")
+
+
 def decode_200_21(data: bytes) -> Dict[str, Any]:
     """
     FID 21: ETA at Lock/Bridge/Terminal.
@@ -139,27 +182,24 @@ def decode_200_21(data: bytes) -> Dict[str, Any]:
     Estimated Time of Arrival request from inland vessel.
     Fixed length: 248 bits
     """
-    bits = BitReader(data)
-    
-    return {
-        "fid": 21,
-        "description": "ETA at Lock/Bridge/Terminal",
-        "country": bits.get_string(0, 12),  # UN country code
-        "location": bits.get_string(12, 18),  # UN location code
-        "section": bits.get_string(30, 30),
-        "terminal": bits.get_string(60, 30),
-        "fairway_section": bits.get_string(90, 30),
-        "fairway_hectometre": bits.get_string(120, 30),
-        "eta_month": bits.get_uint(150, 4),
-        "eta_day": bits.get_uint(154, 5),
-        "eta_hour": bits.get_uint(159, 5),
-        "eta_minute": bits.get_uint(164, 6),
-        "convoy_count": bits.get_uint(170, 3),
-        "convoy_length_m": bits.get_uint(173, 13) / 10.0,
-        "convoy_beam_m": bits.get_uint(186, 10) / 10.0,
-        "convoy_draught_cm": bits.get_uint(196, 11),
-        "direction": bits.get_uint(207, 1),  # 0=downstream, 1=upstream
-    }
+    return _DECODE_200_21(data)
+
+
+# FID 22 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_200_22 = BitLayout([
+    ("country", 0, 12, False, TEXT),  # UN country code
+    ("location", 12, 18, False, TEXT),  # UN location code
+    ("section", 30, 30, False, TEXT),
+    ("terminal", 60, 30, False, TEXT),
+    ("fairway_section", 90, 30, False, TEXT),
+    ("fairway_hectometre", 120, 30, False, TEXT),
+    ("rta_month", 150, 4, False),
+    ("rta_day", 154, 5, False),
+    ("rta_hour", 159, 5, False),
+    ("rta_minute", 164, 6, False),
+    ("rta_status", 170, 2, False),  # 0=confirmed, 1=proposed, etc.
+])
+_DECODE_200_22 = _LAYOUT_200_22.decoder(fid=22, description="RTA at Lock/Bridge/Terminal")
 
 
 def decode_200_22(data: bytes) -> Dict[str, Any]:
@@ -169,23 +209,28 @@ def decode_200_22(data: bytes) -> Dict[str, Any]:
     Recommended Time of Arrival response from infrastructure.
     Fixed length: 232 bits
     """
-    bits = BitReader(data)
-    
-    return {
-        "fid": 22,
-        "description": "RTA at Lock/Bridge/Terminal",
-        "country": bits.get_string(0, 12),
-        "location": bits.get_string(12, 18),
-        "section": bits.get_string(30, 30),
-        "terminal": bits.get_string(60, 30),
-        "fairway_section": bits.get_string(90, 30),
-        "fairway_hectometre": bits.get_string(120, 30),
-        "rta_month": bits.get_uint(150, 4),
-        "rta_day": bits.get_uint(154, 5),
-        "rta_hour": bits.get_uint(159, 5),
-        "rta_minute": bits.get_uint(164, 6),
-        "rta_status": bits.get_uint(170, 2),  # 0=confirmed, 1=proposed, etc.
-    }
+    return _DECODE_200_22(data)
+
+
+# FID 23 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_200_23 = BitLayout([
+    ("start_year", 0, 8, False, "x + 2000"),
+    ("start_month", 8, 4, False),
+    ("start_day", 12, 5, False),
+    ("end_year", 17, 8, False, "x + 2000"),
+    ("end_month", 25, 4, False),
+    ("end_day", 29, 5, False),
+    ("start_hour", 34, 5, False),
+    ("start_minute", 39, 6, False),
+    ("end_hour", 45, 5, False),
+    ("end_minute", 50, 6, False),
+    ("fairway_section", 56, 30, False, TEXT),
+    ("fairway_hectometre_from", 86, 10, False),
+    ("fairway_hectometre_to", 96, 10, False),
+    ("warning_type", 106, 3, False),
+    ("warning_value", 109, 14, True),
+])
+_DECODE_200_23 = _LAYOUT_200_23.decoder(fid=23, description="EMMA Warning")
 
 
 def decode_200_23(data: bytes) -> Dict[str, Any]:
@@ -195,27 +240,19 @@ def decode_200_23(data: bytes) -> Dict[str, Any]:
     Weather warnings for inland waterways.
     Variable length depending on warning type.
     """
-    bits = BitReader(data)
-    
-    return {
-        "fid": 23,
-        "description": "EMMA Warning",
-        "start_year": bits.get_uint(0, 8) + 2000,
-        "start_month": bits.get_uint(8, 4),
-        "start_day": bits.get_uint(12, 5),
-        "end_year": bits.get_uint(17, 8) + 2000,
-        "end_month": bits.get_uint(25, 4),
-        "end_day": bits.get_uint(29, 5),
-        "start_hour": bits.get_uint(34, 5),
-        "start_minute": bits.get_uint(39, 6),
-        "end_hour": bits.get_uint(45, 5),
-        "end_minute": bits.get_uint(50, 6),
-        "fairway_section": bits.get_string(56, 30),
-        "fairway_hectometre_from": bits.get_uint(86, 10),
-        "fairway_hectometre_to": bits.get_uint(96, 10),
-        "warning_type": bits.get_uint(106, 3),
-        "warning_value": bits.get_int(109, 14),
-    }
+    return _DECODE_200_23(data)
+
+
+# FID 24 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_200_24 = BitLayout([
+    ("country", 0, 12, False, TEXT),
+    ("gauge_id", 12, 11, False),
+    ("level_cm", 23, 14, True),  # Water level in cm
+    ("day", 37, 5, False),
+    ("hour", 42, 5, False),
+    ("minute", 47, 6, False),
+])
+_DECODE_200_24 = _LAYOUT_200_24.decoder(fid=24, description="Water Levels")
 
 
 def decode_200_24(data: bytes) -> Dict[str, Any]:
@@ -225,18 +262,19 @@ def decode_200_24(data: bytes) -> Dict[str, Any]:
     Current water level at a measurement station.
     Fixed length: 116 bits
     """
-    bits = BitReader(data)
-    
-    return {
-        "fid": 24,
-        "description": "Water Levels",
-        "country": bits.get_string(0, 12),
-        "gauge_id": bits.get_uint(12, 11),
-        "level_cm": bits.get_int(23, 14),  # Water level in cm
-        "day": bits.get_uint(37, 5),
-        "hour": bits.get_uint(42, 5),
-        "minute": bits.get_uint(47, 6),
-    }
+    return _DECODE_200_24(data)
+
+
+# FID 40 field layout: (name, offset, width, signed[, conversion])
+_LAYOUT_200_40 = BitLayout([
+    ("longitude", 0, 25, True, "x / 60000.0"),
+    ("latitude", 25, 24, True, "x / 60000.0"),
+    ("form", 49, 4, False),  # Signal form/shape
+    ("orientation", 53, 9, False),  # Degrees
+    ("direction", 62, 3, False),  # Impact direction
+    ("status", 65, 30, False),  # Light status bitmask
+])
+_DECODE_200_40 = _LAYOUT_200_40.decoder(fid=40, description="Signal Status")
 
 
 def decode_200_40(data: bytes) -> Dict[str, Any]:
@@ -246,20 +284,16 @@ def decode_200_40(data: bytes) -> Dict[str, Any]:
     Status of inland waterway signals (locks, bridges).
     Fixed length: ~200 bits (varies by implementation)
     """
-    bits = BitReader(data)
-    
-    lon, lat = bits.get_position(0)
-    
-    return {
-        "fid": 40,
-        "description": "Signal Status",
-        "longitude": lon,
-        "latitude": lat,
-        "form": bits.get_uint(49, 4),  # Signal form/shape
-        "orientation": bits.get_uint(53, 9),  # Degrees
-        "direction": bits.get_uint(62, 3),  # Impact direction
-        "status": bits.get_uint(65, 30),  # Light status bitmask
-    }
+    return _DECODE_200_40(data)
+
+
+_LAYOUT_200_55 = BitLayout([
+    ("crew", 0, 8, False),
+    ("passengers", 8, 13, False),
+    ("personnel", 21, 8, False),
+    # Remaining bits are spare/reserved
+])
+_DECODE_200_55 = _LAYOUT_200_55.decoder(fid=55, description="Number of Persons on Board (Inland)")
 
 
 def decode_200_55(data: bytes) -> Dict[str, Any]:
@@ -269,13 +303,19 @@ def decode_200_55(data: bytes) -> Dict[str, Any]:
     Inland vessel variant of persons on board message.
     Fixed length: 168 bits
     """
-    bits = BitReader(data)
-    
-    return {
-        "fid": 55,
-        "description": "Number of Persons on Board (Inland)",
-        "crew": bits.get_uint(0, 8),
-        "passengers": bits.get_uint(8, 13),
-        "personnel": bits.get_uint(21, 8),
-        # Remaining bits are spare/reserved
-    }
+    return _DECODE_200_55(data)
+
+
+# FID -> (decoder, minimum payload bytes), flattened into a tuple indexed by
+# FID so dispatch is a bounds check and a subscript (defined last, after the
+# decoders it names)
+_DECODERS = MappingProxyType({
+    10: (decode_200_10, _LAYOUT_200_10.num_bytes),  # Inland ship static and voyage
+    21: (decode_200_21, _LAYOUT_200_21.num_bytes),  # ETA at lock/bridge/terminal
+    22: (decode_200_22, _LAYOUT_200_22.num_bytes),  # RTA at lock/bridge/terminal
+    23: (decode_200_23, _LAYOUT_200_23.num_bytes),  # EMMA warning
+    24: (decode_200_24, _LAYOUT_200_24.num_bytes),  # Water levels
+    40: (decode_200_40, _LAYOUT_200_40.num_bytes),  # Signal status
+    55: (decode_200_55, _LAYOUT_200_55.num_bytes),  # Number of persons on board
+})
+_DAC200_TABLE = tuple(_DECODERS.get(fid) for fid in range(max(_DECODERS) + 1))
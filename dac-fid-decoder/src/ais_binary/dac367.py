@@ -11,8 +11,10 @@ References:
 """
 
 from __future__ import annotations
-from typing import Dict, Any, List
-from .bitreader import BitReader
+from array import array
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Sequence
+from .bitreader import TEXT, BitLayout
 
 
 # Environmental report types for FID 33
@@ -32,24 +34,89 @@ REPORT_TYPES = {
     12: "Ice",
 }
 
+# Names for every 4-bit report type, indexed by type, with the unknown ones
+# formatted once here rather than per report
+_REPORT_TYPE_NAMES = tuple(REPORT_TYPES.get(t, f"Unknown ({t})") for t in range(16))
+
 
 def decode_dac367(fid: int, data: bytes) -> Dict[str, Any]:
     """
     Dispatch to the appropriate DAC 367 FID decoder.
     """
-    decoders = {
-        22: decode_367_22,  # Area Notice (US version)
-        33: decode_367_33,  # Environmental/weather sensor reports
-    }
-    
-    decoder = decoders.get(fid)
-    if decoder is None:
+    entry = _DAC367_TABLE[fid] if 0 <= fid < len(_DAC367_TABLE) else None
+    if entry is None:
         return {"error": f"Unknown DAC 367 FID {fid}", "raw": data.hex()}
     
-    try:
-        return decoder(data)
-    except Exception as e:
-        return {"error": str(e), "fid": fid, "raw": data.hex()}
+    # Reject payloads too short for the fixed header up front rather than
+    # raising mid-decode
+    decoder, min_bytes = entry
+    if len(data) < min_bytes:
+        return {
+            "error": f"DAC 367 FID {fid} needs {min_bytes} bytes, got {len(data)}",
+            "raw": data.hex(),
+        }
+    
+    # Decoders report malformed payloads in their return value; anything
+    # else propagates to decode_binary_payload, which reports it
+    return decoder(data)
+
+
+# FID 22 header layout: (name, offset, width, signed)
+_LAYOUT_367_22 = BitLayout([
+    ("version", 0, 6, False),
+    ("link_id", 6, 10, False),
+    ("notice_type", 16, 7, False),
+    ("month", 23, 4, False),
+    ("day", 27, 5, False),
+    ("hour", 32, 5, False),
+    ("minute", 37, 6, False),
+    ("duration_min", 43, 18, False),
+])
+_DECODE_367_22_HEADER = _LAYOUT_367_22.decoder(fid=22, description="Area Notice (US)")
+
+
+# FID 22 sub-area layouts by shape, relative to the start of the 90-bit
+# sub-area, whose first 3 bits are the shape
+_POSITION = [
+    ("scale_factor", 3, 2, False),
+    ("longitude", 5, 25, True, "x / 60000.0"),
+    ("latitude", 30, 24, True, "x / 60000.0"),
+    ("precision", 54, 3, False),
+]
+_WAYPOINTS = [
+    ("scale_factor", 3, 2, False),
+    ("angle_1", 5, 10, False),
+    ("dist_1", 15, 10, False),
+    ("angle_2", 25, 10, False),
+    ("dist_2", 35, 10, False),
+    ("angle_3", 45, 10, False),
+    ("dist_3", 55, 10, False),
+    ("angle_4", 65, 10, False),
+    ("dist_4", 75, 10, False),
+]
+_SUB_AREA_LAYOUTS = {
+    0: _POSITION + [("radius_m", 57, 12, False)],  # Circle/point
+    1: _POSITION + [  # Rectangle
+        ("e_dim_m", 57, 8, False),
+        ("n_dim_m", 65, 8, False),
+        ("orientation", 73, 9, False),
+    ],
+    2: _POSITION + [  # Sector
+        ("radius_m", 57, 12, False),
+        ("left_bound", 69, 9, False),
+        ("right_bound", 78, 9, False),
+    ],
+    3: _WAYPOINTS,  # Polyline (waypoint)
+    4: _WAYPOINTS,  # Polygon (waypoint): same as polyline but closed
+    5: [("text", 3, 84, False, TEXT)],  # Text: 14 characters * 6 bits
+}
+_SUB_AREA_RAW = [("raw", 3, 87, False, "hex(x)")]
+
+# Shape -> generated sub-area decoder, indexed by the 3-bit shape
+_SUB_AREA_DECODERS = tuple(
+    BitLayout(_SUB_AREA_LAYOUTS.get(shape, _SUB_AREA_RAW), num_bits=90).record_decoder(shape=shape)
+    for shape in range(8)
+)
 
 
 def decode_367_22(data: bytes) -> Dict[str, Any]:
@@ -59,97 +126,141 @@ def decode_367_22(data: bytes) -> Dict[str, Any]:
     Similar to DAC 001 FID 22 but with US-specific notice types.
     Variable length: 88 + N*90 bits for sub-areas.
     """
-    bits = BitReader(data)
+    result = _DECODE_367_22_HEADER(data)
     
-    result = {
-        "fid": 22,
-        "description": "Area Notice (US)",
-        "version": bits.get_uint(0, 6),
-        "link_id": bits.get_uint(6, 10),
-        "notice_type": bits.get_uint(16, 7),
-        "month": bits.get_uint(23, 4),
-        "day": bits.get_uint(27, 5),
-        "hour": bits.get_uint(32, 5),
-        "minute": bits.get_uint(37, 6),
-        "duration_min": bits.get_uint(43, 18),
-        "sub_areas": [],
-    }
-    
-    # Parse sub-areas (each 90 bits)
-    offset = 61  # After header
-    num_bits = len(data) * 8
+    # Sub-areas are 90 bits each after the 61-bit header. The payload is
+    # converted to an int once and every sub-area's shift is known up
+    # front; the 3-bit shape picks the generated decoder for the rest
+    bits = int.from_bytes(data, 'big')
+    sub_areas = result["sub_areas"] = []
     
-    while offset + 90 <= num_bits:
-        area_shape = bits.get_uint(offset, 3)
-        sub_area = {"shape": area_shape}
-        
-        if area_shape == 0:  # Circle/point
-            sub_area["scale_factor"] = bits.get_uint(offset + 3, 2)
-            lon = bits.get_int(offset + 5, 25) / 60000.0
-            lat = bits.get_int(offset + 30, 24) / 60000.0
-            sub_area["longitude"] = lon
-            sub_area["latitude"] = lat
-            sub_area["precision"] = bits.get_uint(offset + 54, 3)
-            sub_area["radius_m"] = bits.get_uint(offset + 57, 12)
-            
-        elif area_shape == 1:  # Rectangle
-            sub_area["scale_factor"] = bits.get_uint(offset + 3, 2)
-            lon = bits.get_int(offset + 5, 25) / 60000.0
-            lat = bits.get_int(offset + 30, 24) / 60000.0
-            sub_area["longitude"] = lon
-            sub_area["latitude"] = lat
-            sub_area["precision"] = bits.get_uint(offset + 54, 3)
-            sub_area["e_dim_m"] = bits.get_uint(offset + 57, 8)
-            sub_area["n_dim_m"] = bits.get_uint(offset + 65, 8)
-            sub_area["orientation"] = bits.get_uint(offset + 73, 9)
-            
-        elif area_shape == 2:  # Sector
-            sub_area["scale_factor"] = bits.get_uint(offset + 3, 2)
-            lon = bits.get_int(offset + 5, 25) / 60000.0
-            lat = bits.get_int(offset + 30, 24) / 60000.0
-            sub_area["longitude"] = lon
-            sub_area["latitude"] = lat
-            sub_area["precision"] = bits.get_uint(offset + 54, 3)
-            sub_area["radius_m"] = bits.get_uint(offset + 57, 12)
-            sub_area["left_bound"] = bits.get_uint(offset + 69, 9)
-            sub_area["right_bound"] = bits.get_uint(offset + 78, 9)
-            
-        elif area_shape == 3:  # Polyline (waypoint)
-            sub_area["scale_factor"] = bits.get_uint(offset + 3, 2)
-            sub_area["angle_1"] = bits.get_uint(offset + 5, 10)
-            sub_area["dist_1"] = bits.get_uint(offset + 15, 10)
-            sub_area["angle_2"] = bits.get_uint(offset + 25, 10)
-            sub_area["dist_2"] = bits.get_uint(offset + 35, 10)
-            sub_area["angle_3"] = bits.get_uint(offset + 45, 10)
-            sub_area["dist_3"] = bits.get_uint(offset + 55, 10)
-            sub_area["angle_4"] = bits.get_uint(offset + 65, 10)
-            sub_area["dist_4"] = bits.get_uint(offset + 75, 10)
-            
-        elif area_shape == 4:  # Polygon (waypoint)
-            # Same as polyline but closed
-            sub_area["scale_factor"] = bits.get_uint(offset + 3, 2)
-            sub_area["angle_1"] = bits.get_uint(offset + 5, 10)
-            sub_area["dist_1"] = bits.get_uint(offset + 15, 10)
-            sub_area["angle_2"] = bits.get_uint(offset + 25, 10)
-            sub_area["dist_2"] = bits.get_uint(offset + 35, 10)
-            sub_area["angle_3"] = bits.get_uint(offset + 45, 10)
-            sub_area["dist_3"] = bits.get_uint(offset + 55, 10)
-            sub_area["angle_4"] = bits.get_uint(offset + 65, 10)
-            sub_area["dist_4"] = bits.get_uint(offset + 75, 10)
-            
-        elif area_shape == 5:  # Text
-            text_bits = 84  # 14 characters * 6 bits
-            sub_area["text"] = bits.get_string(offset + 3, text_bits)
-            
-        else:
-            sub_area["raw"] = hex(bits.get_uint(offset + 3, 87))
-        
-        result["sub_areas"].append(sub_area)
-        offset += 90
+    for shift in range(len(data) * 8 - 151, -1, -90):
+        # Gather the sub-area into a small int first, so the decoder's
+        # per-field shifts work on 90 bits rather than the whole payload
+        area = (bits >> shift) & 0x3FFFFFFFFFFFFFFFFFFFFFF
+        sub_areas.append(_SUB_AREA_DECODERS[area >> 87](area))
     
     return result
 
 
+# FID 33 report layouts by report type: (name, offset, width, signed[, conversion]).
+# Offsets are relative to the start of the report, whose first 4 bits are the type.
+# All but Location start with the same observation time and site fields.
+_REPORT_TIME_SITE = [
+    ("day", 4, 5, False),
+    ("hour", 9, 5, False),
+    ("minute", 14, 6, False),
+    ("site_id", 20, 7, False),
+]
+_REPORT_LAYOUTS = {
+    0: BitLayout([  # Location
+        ("version", 4, 6, False),
+        ("longitude", 10, 28, True, "x / 600000.0"),
+        ("latitude", 38, 27, True, "x / 600000.0"),
+        ("precision", 65, 4, False),
+        ("altitude_m", 69, 12, True, "x / 10.0"),
+        ("owner", 81, 4, False),
+        ("timeout", 85, 3, False),
+    ]),
+    1: BitLayout(_REPORT_TIME_SITE + [  # Wind
+        ("wind_speed_kts", 27, 7, False),
+        ("wind_gust_kts", 34, 7, False),
+        ("wind_dir", 41, 9, False),
+        ("wind_gust_dir", 50, 9, False),
+        ("sensor_type", 59, 3, False),
+        ("forecast_wind_speed_kts", 62, 7, False),
+        ("forecast_wind_gust_kts", 69, 7, False),
+        ("forecast_wind_dir", 76, 9, False),
+        ("forecast_day", 85, 5, False),
+        ("forecast_hour", 90, 5, False),
+        ("forecast_minute", 95, 6, False),
+        ("duration_min", 101, 8, False),
+    ]),
+    2: BitLayout(_REPORT_TIME_SITE + [  # Water Level
+        ("level_type", 27, 3, False),
+        ("level_m", 30, 16, True, "x / 100.0"),
+        ("trend", 46, 2, False),
+        ("datum", 48, 5, False),
+        ("sensor_type", 53, 3, False),
+        ("forecast_type", 56, 3, False),
+        ("forecast_day", 59, 5, False),
+        ("forecast_hour", 64, 5, False),
+        ("forecast_minute", 69, 6, False),
+        ("duration_min", 75, 8, False),
+    ]),
+    3: BitLayout(_REPORT_TIME_SITE + [  # Current 2D
+        ("cur_speed_kts", 27, 8, False, "x / 10.0"),
+        ("cur_dir", 35, 9, False),
+        ("cur_depth_m", 44, 9, False),
+    ]),
+    7: BitLayout(_REPORT_TIME_SITE + [  # Sea State
+        ("swell_height_m", 27, 8, False, "x / 10.0"),
+        ("swell_period_s", 35, 6, False),
+        ("swell_dir", 41, 9, False),
+        ("sea_state_beaufort", 50, 4, False),
+        ("swell_sensor_type", 54, 3, False),
+        ("water_temp_c", 57, 10, True, "x / 10.0"),
+        ("water_temp_depth_m", 67, 7, False, "x / 10.0"),
+        ("water_sensor_type", 74, 3, False),
+        ("wave_height_m", 77, 8, False, "x / 10.0"),
+        ("wave_period_s", 85, 6, False),
+        ("wave_dir", 91, 9, False),
+        ("wave_sensor_type", 100, 3, False),
+        ("salinity_ppt", 103, 9, False, "x / 10.0"),
+    ]),
+    8: BitLayout(_REPORT_TIME_SITE + [  # Salinity
+        ("water_temp_c", 27, 10, True, "x / 10.0"),
+        ("conductivity", 37, 10, False, "x / 100.0"),
+        ("pressure_dbar", 47, 16, False, "x / 10.0"),
+        ("salinity_ppt", 63, 9, False, "x / 10.0"),
+        ("salinity_type", 72, 2, False),
+        ("sensor_type", 74, 3, False),
+    ]),
+    9: BitLayout(_REPORT_TIME_SITE + [  # Weather
+        ("air_temp_c", 27, 11, True, "x / 10.0"),
+        ("air_temp_sensor", 38, 3, False),
+        ("precip_type", 41, 3, False),
+        ("visibility_nm", 44, 8, False, "x / 10.0"),
+        ("dew_point_c", 52, 10, True, "x / 10.0"),
+        ("dew_sensor", 62, 3, False),
+        ("air_pressure_hpa", 65, 9, False, "x + 800"),
+        ("pressure_trend", 74, 2, False),
+        ("pressure_sensor", 76, 3, False),
+        ("salinity_ppt", 79, 9, False, "x / 10.0"),
+    ]),
+    10: BitLayout(_REPORT_TIME_SITE + [  # Air Gap
+        ("air_draught_m", 27, 13, False, "x / 10.0"),
+        ("air_gap_m", 40, 13, False, "x / 10.0"),
+        ("air_gap_trend", 53, 2, False),
+        ("predicted_air_gap_m", 55, 13, False, "x / 10.0"),
+        ("forecast_day", 68, 5, False),
+        ("forecast_hour", 73, 5, False),
+        ("forecast_minute", 78, 6, False),
+    ]),
+    11: BitLayout(_REPORT_TIME_SITE + [  # Air Pressure
+        ("air_pressure_hpa", 27, 9, False, "x + 800"),
+        ("pressure_trend", 36, 2, False),
+        ("sensor_type", 38, 3, False),
+        ("forecast_pressure", 41, 9, False, "x + 800"),
+        ("forecast_day", 50, 5, False),
+        ("forecast_hour", 55, 5, False),
+        ("forecast_minute", 60, 6, False),
+        ("duration_min", 66, 8, False),
+    ]),
+}
+
+# Report type -> (report size in bits, record mask, record decoder), None
+# where the type is not implemented; indexed by the 4-bit type so lookup
+# never misses, with everything the report loop needs baked in
+_REPORT_SPEC = tuple(
+    (_REPORT_LAYOUTS[t].num_bits,
+     (1 << _REPORT_LAYOUTS[t].num_bits) - 1,
+     _REPORT_LAYOUTS[t].record_decoder(type=t, type_name=_REPORT_TYPE_NAMES[t]))
+    if t in _REPORT_LAYOUTS else None
+    for t in range(16)
+)
+
+
 def decode_367_33(data: bytes) -> Dict[str, Any]:
     """
     FID 33: Environmental/Weather Sensor Reports.
@@ -157,10 +268,10 @@ def decode_367_33(data: bytes) -> Dict[str, Any]:
     Multi-sensor environmental data broadcast.
     Variable length: header + N report blocks.
     
-    This is a complex message with multiple sensor report types.
+    This is a complex message with multiple sensor report types, decoded
+    from the _REPORT_LAYOUTS table. A payload ending partway through a
+    report yields an error dict rather than raising.
     """
-    bits = BitReader(data)
-    
     result = {
         "fid": 33,
         "description": "Environmental Sensor Reports (US)",
@@ -169,161 +280,99 @@ def decode_367_33(data: bytes) -> Dict[str, Any]:
     
     # There's a location header for some versions
     num_bits = len(data) * 8
-    offset = 0
+    bits = int.from_bytes(data, 'big')
+    remaining = num_bits
     
-    # Parse reports until we run out of bits
-    while offset + 27 <= num_bits:  # Minimum report size
-        report_type = bits.get_uint(offset, 4)
-        report_type_name = REPORT_TYPES.get(report_type, f"Unknown ({report_type})")
-        
-        report = {
-            "type": report_type,
-            "type_name": report_type_name,
-        }
-        
-        if report_type == 0:  # Location
-            report["version"] = bits.get_uint(offset + 4, 6)
-            lon = bits.get_int(offset + 10, 28) / 600000.0
-            lat = bits.get_int(offset + 38, 27) / 600000.0
-            report["longitude"] = lon
-            report["latitude"] = lat
-            report["precision"] = bits.get_uint(offset + 65, 4)
-            report["altitude_m"] = bits.get_int(offset + 69, 12) / 10.0
-            report["owner"] = bits.get_uint(offset + 81, 4)
-            report["timeout"] = bits.get_uint(offset + 85, 3)
-            offset += 88
-            
-        elif report_type == 1:  # Wind
-            report["day"] = bits.get_uint(offset + 4, 5)
-            report["hour"] = bits.get_uint(offset + 9, 5)
-            report["minute"] = bits.get_uint(offset + 14, 6)
-            report["site_id"] = bits.get_uint(offset + 20, 7)
-            report["wind_speed_kts"] = bits.get_uint(offset + 27, 7)
-            report["wind_gust_kts"] = bits.get_uint(offset + 34, 7)
-            report["wind_dir"] = bits.get_uint(offset + 41, 9)
-            report["wind_gust_dir"] = bits.get_uint(offset + 50, 9)
-            report["sensor_type"] = bits.get_uint(offset + 59, 3)
-            report["forecast_wind_speed_kts"] = bits.get_uint(offset + 62, 7)
-            report["forecast_wind_gust_kts"] = bits.get_uint(offset + 69, 7)
-            report["forecast_wind_dir"] = bits.get_uint(offset + 76, 9)
-            report["forecast_day"] = bits.get_uint(offset + 85, 5)
-            report["forecast_hour"] = bits.get_uint(offset + 90, 5)
-            report["forecast_minute"] = bits.get_uint(offset + 95, 6)
-            report["duration_min"] = bits.get_uint(offset + 101, 8)
-            offset += 109
-            
-        elif report_type == 2:  # Water Level
-            report["day"] = bits.get_uint(offset + 4, 5)
-            report["hour"] = bits.get_uint(offset + 9, 5)
-            report["minute"] = bits.get_uint(offset + 14, 6)
-            report["site_id"] = bits.get_uint(offset + 20, 7)
-            report["level_type"] = bits.get_uint(offset + 27, 3)
-            report["level_m"] = bits.get_int(offset + 30, 16) / 100.0
-            report["trend"] = bits.get_uint(offset + 46, 2)
-            report["datum"] = bits.get_uint(offset + 48, 5)
-            report["sensor_type"] = bits.get_uint(offset + 53, 3)
-            report["forecast_type"] = bits.get_uint(offset + 56, 3)
-            report["forecast_day"] = bits.get_uint(offset + 59, 5)
-            report["forecast_hour"] = bits.get_uint(offset + 64, 5)
-            report["forecast_minute"] = bits.get_uint(offset + 69, 6)
-            report["duration_min"] = bits.get_uint(offset + 75, 8)
-            offset += 83
-            
-        elif report_type == 3:  # Current 2D
-            report["day"] = bits.get_uint(offset + 4, 5)
-            report["hour"] = bits.get_uint(offset + 9, 5)
-            report["minute"] = bits.get_uint(offset + 14, 6)
-            report["site_id"] = bits.get_uint(offset + 20, 7)
-            report["cur_speed_kts"] = bits.get_uint(offset + 27, 8) / 10.0
-            report["cur_dir"] = bits.get_uint(offset + 35, 9)
-            report["cur_depth_m"] = bits.get_uint(offset + 44, 9)
-            offset += 53
-            
-        elif report_type == 7:  # Sea State
-            report["day"] = bits.get_uint(offset + 4, 5)
-            report["hour"] = bits.get_uint(offset + 9, 5)
-            report["minute"] = bits.get_uint(offset + 14, 6)
-            report["site_id"] = bits.get_uint(offset + 20, 7)
-            report["swell_height_m"] = bits.get_uint(offset + 27, 8) / 10.0
-            report["swell_period_s"] = bits.get_uint(offset + 35, 6)
-            report["swell_dir"] = bits.get_uint(offset + 41, 9)
-            report["sea_state_beaufort"] = bits.get_uint(offset + 50, 4)
-            report["swell_sensor_type"] = bits.get_uint(offset + 54, 3)
-            report["water_temp_c"] = bits.get_int(offset + 57, 10) / 10.0
-            report["water_temp_depth_m"] = bits.get_uint(offset + 67, 7) / 10.0
-            report["water_sensor_type"] = bits.get_uint(offset + 74, 3)
-            report["wave_height_m"] = bits.get_uint(offset + 77, 8) / 10.0
-            report["wave_period_s"] = bits.get_uint(offset + 85, 6)
-            report["wave_dir"] = bits.get_uint(offset + 91, 9)
-            report["wave_sensor_type"] = bits.get_uint(offset + 100, 3)
-            report["salinity_ppt"] = bits.get_uint(offset + 103, 9) / 10.0
-            offset += 112
-            
-        elif report_type == 8:  # Salinity
-            report["day"] = bits.get_uint(offset + 4, 5)
-            report["hour"] = bits.get_uint(offset + 9, 5)
-            report["minute"] = bits.get_uint(offset + 14, 6)
-            report["site_id"] = bits.get_uint(offset + 20, 7)
-            report["water_temp_c"] = bits.get_int(offset + 27, 10) / 10.0
-            report["conductivity"] = bits.get_uint(offset + 37, 10) / 100.0
-            report["pressure_dbar"] = bits.get_uint(offset + 47, 16) / 10.0
-            report["salinity_ppt"] = bits.get_uint(offset + 63, 9) / 10.0
-            report["salinity_type"] = bits.get_uint(offset + 72, 2)
-            report["sensor_type"] = bits.get_uint(offset + 74, 3)
-            offset += 77
-            
-        elif report_type == 9:  # Weather
-            report["day"] = bits.get_uint(offset + 4, 5)
-            report["hour"] = bits.get_uint(offset + 9, 5)
-            report["minute"] = bits.get_uint(offset + 14, 6)
-            report["site_id"] = bits.get_uint(offset + 20, 7)
-            report["air_temp_c"] = bits.get_int(offset + 27, 11) / 10.0
-            report["air_temp_sensor"] = bits.get_uint(offset + 38, 3)
-            report["precip_type"] = bits.get_uint(offset + 41, 3)
-            report["visibility_nm"] = bits.get_uint(offset + 44, 8) / 10.0
-            report["dew_point_c"] = bits.get_int(offset + 52, 10) / 10.0
-            report["dew_sensor"] = bits.get_uint(offset + 62, 3)
-            report["air_pressure_hpa"] = bits.get_uint(offset + 65, 9) + 800
-            report["pressure_trend"] = bits.get_uint(offset + 74, 2)
-            report["pressure_sensor"] = bits.get_uint(offset + 76, 3)
-            report["salinity_ppt"] = bits.get_uint(offset + 79, 9) / 10.0
-            offset += 88
-            
-        elif report_type == 10:  # Air Gap
-            report["day"] = bits.get_uint(offset + 4, 5)
-            report["hour"] = bits.get_uint(offset + 9, 5)
-            report["minute"] = bits.get_uint(offset + 14, 6)
-            report["site_id"] = bits.get_uint(offset + 20, 7)
-            report["air_draught_m"] = bits.get_uint(offset + 27, 13) / 10.0
-            report["air_gap_m"] = bits.get_uint(offset + 40, 13) / 10.0
-            report["air_gap_trend"] = bits.get_uint(offset + 53, 2)
-            report["predicted_air_gap_m"] = bits.get_uint(offset + 55, 13) / 10.0
-            report["forecast_day"] = bits.get_uint(offset + 68, 5)
-            report["forecast_hour"] = bits.get_uint(offset + 73, 5)
-            report["forecast_minute"] = bits.get_uint(offset + 78, 6)
-            offset += 84
-            
-        elif report_type == 11:  # Air Pressure
-            report["day"] = bits.get_uint(offset + 4, 5)
-            report["hour"] = bits.get_uint(offset + 9, 5)
-            report["minute"] = bits.get_uint(offset + 14, 6)
-            report["site_id"] = bits.get_uint(offset + 20, 7)
-            report["air_pressure_hpa"] = bits.get_uint(offset + 27, 9) + 800
-            report["pressure_trend"] = bits.get_uint(offset + 36, 2)
-            report["sensor_type"] = bits.get_uint(offset + 38, 3)
-            report["forecast_pressure"] = bits.get_uint(offset + 41, 9) + 800
-            report["forecast_day"] = bits.get_uint(offset + 50, 5)
-            report["forecast_hour"] = bits.get_uint(offset + 55, 5)
-            report["forecast_minute"] = bits.get_uint(offset + 60, 6)
-            report["duration_min"] = bits.get_uint(offset + 66, 8)
-            offset += 74
-            
-        else:
-            # Unknown report type, skip remaining
-            report["raw_remaining"] = data[offset // 8:].hex()
-            result["reports"].append(report)
+    # Parse reports until we run out of bits. `remaining` doubles as the
+    # shift that brings the next report's end to the bottom of `bits`; each
+    # report is masked out whole and decoded by its type's record decoder
+    reports = result["reports"]
+    while remaining >= 27:  # Minimum report size
+        spec = _REPORT_SPEC[(bits >> (remaining - 4)) & 0xF]
+        if spec is None:
             break
-        
-        result["reports"].append(report)
+        size, mask, decode_report = spec
+        if size > remaining:
+            return {
+                "error": f"Report at bit {num_bits - remaining} needs {size} bits, payload has {remaining}",
+                "fid": 33,
+                "raw": data.hex(),
+            }
+        remaining -= size
+        reports.append(decode_report((bits >> remaining) & mask))
+    else:
+        return result
     
+    # Unknown report type: its size is unknown, so the rest of the payload
+    # can't be framed and is kept as hex, once, outside the report loop
+    report_type = (bits >> (remaining - 4)) & 0xF
+    reports.append({
+        "type": report_type,
+        "type_name": _REPORT_TYPE_NAMES[report_type],
+        "raw_remaining": memoryview(data)[(num_bits - remaining) // 8:].hex(),
+    })
     return result
+
+
+def decode_367_33_batch(payloads: Iterable[bytes]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Decode many FID 33 payloads, grouping their reports by type name.
+    
+    Reports match decode_367_33 and keep their payload order within each
+    group, so a backfill can hand e.g. all "Wind" reports to one table
+    writer instead of re-sorting mixed report lists message by message.
+    
+    Raises:
+        ValueError: If any payload ends partway through a report
+    """
+    by_type: Dict[str, List[Dict[str, Any]]] = {}
+    for data in payloads:
+        decoded = decode_367_33(data)
+        if "error" in decoded:
+            raise ValueError(decoded["error"])
+        for report in decoded["reports"]:
+            group = by_type.get(report["type_name"])
+            if group is None:
+                group = by_type[report["type_name"]] = []
+            group.append(report)
+    return by_type
+
+
+def decode_367_33_columns(payloads: Iterable[bytes]) -> Dict[str, Dict[str, Sequence[Any]]]:
+    """
+    Decode many FID 33 payloads into columns, one table per report type.
+    
+    Each report type name maps to one column per field (struct of arrays),
+    in payload order, ready for a DataFrame or a columnar writer without
+    transposing report dicts downstream. Numeric columns are compact
+    array.array objects (int64 or double), which NumPy can wrap without
+    copying via np.frombuffer; text columns are lists. See
+    decode_367_33_batch.
+    
+    Raises:
+        ValueError: If any payload ends partway through a report
+    """
+    return {
+        type_name: {field: _column([report[field] for report in group]) for field in group[0]}
+        for type_name, group in decode_367_33_batch(payloads).items()
+    }
+
+
+# Value type -> array typecode for numeric columns
+_COLUMN_TYPECODES = {int: 'q', float: 'd'}
+
+
+def _column(values: List[Any]) -> Sequence[Any]:
+    """Pack a column of one field's values into an array if it is numeric."""
+    typecode = _COLUMN_TYPECODES.get(type(values[0]))
+    return array(typecode, values) if typecode else values
+
+
+# FID -> (decoder, minimum payload bytes), flattened into a tuple indexed by
+# FID so dispatch is a bounds check and a subscript (defined last, after the
+# decoders it names)
+_DECODERS = MappingProxyType({
+    22: (decode_367_22, _LAYOUT_367_22.num_bytes),  # Area Notice (US version)
+    33: (decode_367_33, 1),  # Environmental/weather sensor reports
+})
+_DAC367_TABLE = tuple(_DECODERS.get(fid) for fid in range(max(_DECODERS) + 1))
@@ -8,7 +8,7 @@ Test data sourced from:
 """
 
 import pytest
-from ais_binary import decode_binary_payload, BitReader, bits_from_ais_payload
+from ais_binary import decode_binary_payload, BitLayout, BitReader, bits_from_ais_payload
 
 
 class TestBitReader:
@@ -23,7 +23,18 @@ class TestBitReader:
         assert reader.get_uint(8, 8) == 0xAD
         assert reader.get_uint(0, 4) == 0xD  # 1101
         assert reader.get_uint(4, 4) == 0xE  # 1110
-    
+
+    def test_get_uint_unaligned_span(self):
+        # Fields crossing several byte boundaries
+        data = bytes.fromhex('DEADBEEF')
+        reader = BitReader(data)
+
+        assert reader.get_uint(4, 8) == 0xEA
+        assert reader.get_uint(3, 25) == 0xDEADBEEF >> 4 & ((1 << 25) - 1)
+        assert reader.get_uint(0, 32) == 0xDEADBEEF
+        with pytest.raises(ValueError):
+            reader.get_uint(28, 8)
+
     def test_get_int_positive(self):
         data = bytes.fromhex('7F')  # 01111111 = 127
         reader = BitReader(data)
@@ -40,6 +51,18 @@ class TestBitReader:
         assert reader.get_bool(0) == True
         assert reader.get_bool(1) == False
     
+    def test_free_functions_match(self):
+        from ais_binary.bitreader import read_int, read_string, read_uint
+        
+        data = bytes.fromhex('DEADBEEF')
+        reader = BitReader(data)
+        for offset, width in ((0, 8), (4, 8), (3, 25), (20, 12)):
+            assert read_uint(data, offset, width) == reader.get_uint(offset, width)
+            assert read_int(data, offset, width) == reader.get_int(offset, width)
+        assert read_string(data, 2, 24) == reader.get_string(2, 24)
+        with pytest.raises(ValueError):
+            read_uint(data, 28, 8)
+    
     def test_get_string(self):
         # AIS 6-bit encoding: 'H' = 8, 'I' = 9 (after mapping)
         # Let's test with a known string
@@ -50,6 +73,68 @@ class TestBitReader:
         assert result == "AA"
 
 
+class TestBitLayout:
+    """Test the precompiled field layout."""
+    
+    def test_matches_bit_reader(self):
+        data = bytes.fromhex('DEADBEEF')
+        layout = BitLayout([
+            ('a', 0, 4, False),
+            ('b', 4, 8, True),
+            ('c', 12, 20, False),
+        ])
+        reader = BitReader(data)
+        
+        assert layout.names == ('a', 'b', 'c')
+        assert layout.unpack(data) == [
+            reader.get_uint(0, 4),
+            reader.get_int(4, 8),
+            reader.get_uint(12, 20),
+        ]
+    
+    def test_conversion_and_decoder(self):
+        layout = BitLayout([
+            ('temp', 0, 8, True, 'x / 10.0'),
+            ('flag', 8, 1, False, 'x == 1'),
+        ])
+        data = bytes([0xF6, 0x80])  # -10, 1
+        
+        assert layout.unpack(data) == [-1.0, True]
+        decode = layout.decoder(fid=99, description='Test')
+        result = decode(data)
+        assert result == {'fid': 99, 'description': 'Test', 'temp': -1.0, 'flag': True}
+        assert list(result) == ['fid', 'description', 'temp', 'flag']
+    
+    def test_text_field(self):
+        from ais_binary.bitreader import TEXT
+        
+        layout = BitLayout([('name', 0, 12, False, TEXT), ('rest', 12, 4, False)])
+        assert layout.unpack(bytes.fromhex('0410')) == ['AA', 0]
+        with pytest.raises(ValueError):
+            BitLayout([('name', 0, 10, False, TEXT)])
+    
+    def test_short_data(self):
+        layout = BitLayout([('a', 0, 12, False)])
+        assert layout.unpack(bytes.fromhex('ABCD')) == [0xABC]
+        with pytest.raises(ValueError):
+            layout.unpack(bytes.fromhex('AB'))
+    
+    def test_record_decoder(self):
+        """Record decoders read a right-aligned int of num_bits bits."""
+        layout = BitLayout([('kind', 0, 3, False), ('value', 3, 6, True)])
+        decode = layout.record_decoder(type=1)
+        
+        assert layout.num_bits == 9
+        assert decode(0b101_111110) == {'type': 1, 'kind': 5, 'value': -2}
+        assert decode(0b101_111110) == layout.decoder(type=1)(bytes([0b10111111, 0]))
+        
+        # Fixed-width records with spare trailing bits
+        padded = BitLayout([('kind', 0, 3, False)], num_bits=8)
+        assert padded.record_decoder()(0b101_00000) == {'kind': 5}
+        with pytest.raises(ValueError):
+            BitLayout([('kind', 0, 3, False)], num_bits=2)
+
+
 class TestBitsFromAisPayload:
     """Test the AIS payload dearmoring."""
     
@@ -68,6 +153,12 @@ class TestBitsFromAisPayload:
         # With padding removed, we have fewer bits
         assert len(result_with_pad) <= len(result_no_pad)
 
+    def test_known_bytes(self):
+        # '0' = 000000, 'w' = 111111 -> 0000 0011 1111 (0000 fill)
+        assert bits_from_ais_payload("0w") == bytes([0x03, 0xF0])
+        # Dropping 4 pad bits leaves exactly one byte
+        assert bits_from_ais_payload("0w", 4) == bytes([0x03])
+
 
 class TestDAC001:
     """Test DAC 001 (International/IMO) message decoders."""
@@ -106,6 +197,31 @@ class TestDAC001:
         # Should have air_draught_m field
         if 'error' not in result:
             assert 'air_draught_m' in result
+    
+    def test_short_payload(self):
+        """Payloads shorter than the FID's layout are rejected up front."""
+        result = decode_binary_payload(dac=1, fid=31, data=bytes(10))
+        assert result['fid'] == 31
+        assert 'needs 37 bytes' in result['error']
+        assert result['raw'] == '00' * 10
+    
+    def test_scaled_values_are_exact(self):
+        """Scaling divides, so 0.1-unit values carry no float noise."""
+        # air_draught = 3 -> 00000000011 00000 = 0x00, 0x60
+        result = decode_binary_payload(dac=1, fid=15, data=bytes([0x00, 0x60]))
+        assert result['air_draught_m'] == 0.3
+    
+    def test_fid_31_batch_matches_single(self):
+        """FID 31 batch decode yields the same values as single decodes."""
+        from ais_binary.dac001 import decode_001_31, decode_001_31_batch
+        
+        payloads = [bytes(range(i, i + 45)) for i in range(3)]
+        columns = decode_001_31_batch(payloads)
+        
+        for i, data in enumerate(payloads):
+            single = decode_001_31(data)
+            for name, values in columns.items():
+                assert values[i] == single[name]
 
 
 class TestDAC200:
@@ -134,6 +250,55 @@ class TestDAC367:
         assert result['fid'] == 99
         assert 'error' in result
         assert 'raw' in result
+    
+    def test_fid_22_short_payload(self):
+        """FID 22 payloads shorter than the header are rejected up front."""
+        result = decode_binary_payload(dac=367, fid=22, data=bytes(5))
+        assert 'needs 8 bytes' in result['error']
+        assert result['raw'] == '00' * 5
+    
+    def test_fid_33_batch_groups_by_type(self):
+        """FID 33 batch decode groups reports by type, in payload order."""
+        from ais_binary.dac367 import (
+            decode_367_33, decode_367_33_batch, decode_367_33_columns,
+        )
+        
+        # Wind report (type 1, 109 bits) then Air Pressure (type 11, 74 bits)
+        bits = (1 << 105) << 74 | (11 << 70) | 5
+        wind_then_pressure = (bits << 1).to_bytes(23, 'big')
+        pressure_only = ((11 << 70 | 7) << 6).to_bytes(10, 'big')
+        
+        groups = decode_367_33_batch([wind_then_pressure, pressure_only])
+        
+        assert list(groups) == ["Wind", "Air Pressure"]
+        assert groups["Wind"] == decode_367_33(wind_then_pressure)["reports"][:1]
+        assert [r["duration_min"] for r in groups["Air Pressure"]] == [5, 7]
+        
+        columns = decode_367_33_columns([wind_then_pressure, pressure_only])
+        assert columns["Air Pressure"]["duration_min"].tolist() == [5, 7]
+        assert columns["Air Pressure"]["type_name"] == ["Air Pressure"] * 2
+        assert list(columns["Wind"]) == list(groups["Wind"][0])
+    
+    def test_fid_33_scaled_values_are_exact(self):
+        """Scaled report values divide, so 3 tenths of a knot is exactly 0.3."""
+        # Current 2D report (type 3, 53 bits) with a speed of 3
+        report = (3 << 49) | (3 << 18)
+        data = (report << 3).to_bytes(7, 'big')
+        
+        result = decode_binary_payload(dac=367, fid=33, data=data)
+        assert result['reports'][0]['cur_speed_kts'] == 0.3
+    
+    def test_fid_33_truncated_report(self):
+        """A report cut off by the end of the payload is an error, not an exception."""
+        from ais_binary.dac367 import decode_367_33, decode_367_33_batch
+        
+        # Wind report (type 1) needs 109 bits; give it 32
+        data = bytes([0x10, 0, 0, 0])
+        
+        assert 'needs 109 bits' in decode_367_33(data)['error']
+        assert 'error' in decode_binary_payload(dac=367, fid=33, data=data)
+        with pytest.raises(ValueError):
+            decode_367_33_batch([data])
 
 
 class TestUnknownDAC:
@@ -11,20 +11,30 @@ Usage:
     uv run db/decoder.py                    # Continuous mode
     uv run db/decoder.py --once             # Process pending and exit
     uv run db/decoder.py --batch-size 5000  # Larger batches for backfill
+    uv run db/decoder.py --once --bulk      # Backfill, rebuild indexes at end
 """
 
 import argparse
+import binascii
+import heapq
 import json
+import os
+import queue
 import sqlite3
 import sys
+import threading
 import time
+from array import array
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
 
 from pyais import decode
 from pyais.exceptions import InvalidNMEAMessageException
+from pyais.messages import to_10th, to_lat_lon, to_speed, to_turn
 
 # Add dac-fid-decoder to path
 DAC_DECODER_PATH = Path(__file__).parent.parent / "dac-fid-decoder" / "src"
@@ -58,6 +68,244 @@ BINARY_TYPES = {6, 8, 25, 26}
 # Safety-related message types
 SAFETY_TYPES = {12, 14}
 
+# Insert statements. Rows are queued per batch and written with executemany.
+# nav_status and turn come last: Class B reports (types 18/19) lack both
+# and bind the POSITION_B fields followed by two NULLs
+INSERT_POSITION_SQL = """
+    INSERT INTO positions (
+        raw_message_id, timestamp, mmsi, msg_type,
+        lat, lon, speed, course, heading, accuracy, raim, nav_status, turn
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Replaces the latest_positions row of each vessel with positions after the
+# bound id by its last one (migrate.py's latest_positions_src). Run once per
+# batch, after its positions and vessel upserts.
+REFRESH_LATEST_SQL = """
+    INSERT OR REPLACE INTO latest_positions (
+        mmsi, raw_message_id, timestamp, msg_type, lat, lon,
+        speed, course, heading, nav_status,
+        shipname, callsign, imo, ship_type, destination,
+        draught, eta_month, eta_day, eta_hour, eta_minute,
+        to_bow, to_stern, to_port, to_starboard
+    )
+    SELECT
+        mmsi, raw_message_id, timestamp, msg_type, lat, lon,
+        speed, course, heading, nav_status,
+        shipname, callsign, imo, ship_type, destination,
+        draught, eta_month, eta_day, eta_hour, eta_minute,
+        to_bow, to_stern, to_port, to_starboard
+    FROM latest_positions_src
+    WHERE id IN (
+        SELECT MAX(id) FROM positions NOT INDEXED WHERE id > ? GROUP BY mmsi
+    )
+"""
+
+# One upsert per vessel per batch, covering its static reports and its
+# position count. Fields no report carried are bound as NULL, which the
+# COALESCEs leave untouched (see _vessel_row).
+UPSERT_VESSEL_SQL = """
+    INSERT INTO vessels (
+        mmsi, shipname, callsign, imo, ship_type, destination,
+        eta_month, eta_day, eta_hour, eta_minute, draught,
+        to_bow, to_stern, to_port, to_starboard,
+        ais_version, epfd, first_seen, last_seen, position_count, static_count
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(mmsi) DO UPDATE SET
+        shipname = COALESCE(excluded.shipname, shipname),
+        callsign = COALESCE(excluded.callsign, callsign),
+        imo = COALESCE(excluded.imo, imo),
+        ship_type = COALESCE(excluded.ship_type, ship_type),
+        destination = COALESCE(excluded.destination, destination),
+        eta_month = COALESCE(excluded.eta_month, eta_month),
+        eta_day = COALESCE(excluded.eta_day, eta_day),
+        eta_hour = COALESCE(excluded.eta_hour, eta_hour),
+        eta_minute = COALESCE(excluded.eta_minute, eta_minute),
+        draught = COALESCE(excluded.draught, draught),
+        to_bow = COALESCE(excluded.to_bow, to_bow),
+        to_stern = COALESCE(excluded.to_stern, to_stern),
+        to_port = COALESCE(excluded.to_port, to_port),
+        to_starboard = COALESCE(excluded.to_starboard, to_starboard),
+        ais_version = COALESCE(excluded.ais_version, ais_version),
+        epfd = COALESCE(excluded.epfd, epfd),
+        last_seen = excluded.last_seen,
+        position_count = position_count + excluded.position_count,
+        static_count = static_count + excluded.static_count
+"""
+
+INSERT_BASE_STATION_SQL = """
+    INSERT INTO base_stations (
+        raw_message_id, timestamp, mmsi, lat, lon, accuracy, epfd
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_NAV_AID_SQL = """
+    INSERT INTO nav_aids (
+        raw_message_id, timestamp, mmsi, aid_type, name,
+        lat, lon, accuracy,
+        to_bow, to_stern, to_port, to_starboard, virtual_aid
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_BINARY_MESSAGE_SQL = """
+    INSERT INTO binary_messages (
+        raw_message_id, timestamp, mmsi, msg_type,
+        dest_mmsi, dac, fid, raw_data, decoded_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_SAFETY_MESSAGE_SQL = """
+    INSERT INTO safety_messages (
+        raw_message_id, timestamp, mmsi, msg_type, dest_mmsi, text
+    ) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# AIS six-bit payload characters, in value order, and the same values in the
+# base64 alphabet so a2b_base64 can unpack the bits
+ARMOR_CHARS = bytes(range(48, 88)) + bytes(range(96, 120))
+ARMOR_TO_BASE64 = bytes.maketrans(
+    ARMOR_CHARS, b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+)
+
+# Message fields for a positions row after raw_message_id and timestamp, for
+# reports with a navigation status (Class A types 1-3 and long-range type 27,
+# which lacks heading and turn; see _fields) and Class B (types 18/19)
+POSITION_B_KEYS = (
+    "mmsi", "msg_type", "lat", "lon", "speed", "course", "heading", "accuracy", "raim",
+)
+POSITION_A_KEYS = POSITION_B_KEYS + ("status", "turn")
+POSITION_A = (itemgetter(*POSITION_A_KEYS), POSITION_A_KEYS)
+POSITION_B = (itemgetter(*POSITION_B_KEYS), POSITION_B_KEYS)
+
+# Message fields for each kind of static report, and where they go in an
+# UPSERT_VESSEL_SQL row. The itemgetters pull them in one C call; see
+# _fields() for messages that lack some keys.
+VESSEL_KEYS = (
+    "mmsi", "shipname", "callsign", "imo", "ship_type", "destination",
+    "month", "day", "hour", "minute", "draught",
+    "to_bow", "to_stern", "to_port", "to_starboard", "ais_version", "epfd",
+)
+VESSEL_A_KEYS = ("mmsi", "shipname")
+VESSEL_B_KEYS = (
+    "mmsi", "callsign", "ship_type", "to_bow", "to_stern", "to_port", "to_starboard",
+)
+VESSEL_TYPE19_KEYS = (
+    "mmsi", "shipname", "ship_type", "to_bow", "to_stern", "to_port", "to_starboard",
+    "epfd",
+)
+VESSEL_A = (itemgetter(*VESSEL_A_KEYS), VESSEL_A_KEYS)
+VESSEL_B = (itemgetter(*VESSEL_B_KEYS), VESSEL_B_KEYS)
+VESSEL_FULL = (itemgetter(*VESSEL_KEYS), VESSEL_KEYS)
+VESSEL_TYPE19 = (itemgetter(*VESSEL_TYPE19_KEYS), VESSEL_TYPE19_KEYS)
+VESSEL_SLOTS = {
+    keys: tuple(VESSEL_KEYS.index(k) for k in keys)
+    for keys in (VESSEL_A_KEYS, VESSEL_B_KEYS, VESSEL_KEYS, VESSEL_TYPE19_KEYS)
+}
+
+# Raw lon/lat for "not available" (181 and 91 degrees in 1/10000 minute)
+LON_NOT_AVAILABLE = 181 * 600000
+LAT_NOT_AVAILABLE = 91 * 600000
+
+
+def _decode_position(sentence: bytes) -> Optional[dict]:
+    """
+    Decode a single-sentence Type 1/2/3/18 report without pyais objects.
+
+    Only well-formed 168-bit !AIVDM/!AIVDO sentences are handled; anything
+    else returns None and goes through pyais. Values use pyais' own
+    converters, so the result matches the position fields of asdict(),
+    except that status, accuracy and raim are plain ints: sqlite3 binds
+    exact ints directly but runs its adapter lookup for the IntEnum/bool
+    subclasses, and stores the same integer either way. Reports without a
+    position only get msg_type and mmsi.
+    """
+    sentence = sentence.strip()
+    if sentence[:7] != b"!AIVDM," and sentence[:7] != b"!AIVDO,":
+        return None
+    fields = sentence.split(b",")
+    if len(fields) != 7 or fields[1] != b"1" or fields[2] != b"1":
+        return None
+    seq_id = fields[3]
+    payload = fields[5]
+    if seq_id and not seq_id.isdigit():
+        return None
+    if len(payload) != 28 or not fields[6].startswith(b"0*"):
+        return None
+    if payload[0] not in b"123B" or payload.translate(None, ARMOR_CHARS):
+        return None
+    if not sentence.isascii():
+        return None
+
+    v = int.from_bytes(binascii.a2b_base64(payload.translate(ARMOR_TO_BASE64)), "big")
+    msg_type = v >> 162
+    if msg_type == 18:
+        lon = (v >> 83) & 0xFFFFFFF
+        lat = (v >> 56) & 0x7FFFFFF
+        if lon == LON_NOT_AVAILABLE or lat == LAT_NOT_AVAILABLE:
+            # Not stored; skip converting the other fields
+            return {"msg_type": 18, "mmsi": (v >> 130) & 0x3FFFFFFF}
+        return {
+            "msg_type": 18,
+            "mmsi": (v >> 130) & 0x3FFFFFFF,
+            "speed": to_speed((v >> 112) & 0x3FF),
+            "accuracy": (v >> 111) & 1,
+            "lon": to_lat_lon((lon ^ 0x8000000) - 0x8000000),
+            "lat": to_lat_lon((lat ^ 0x4000000) - 0x4000000),
+            "course": to_10th((v >> 44) & 0xFFF),
+            "heading": (v >> 35) & 0x1FF,
+            "raim": (v >> 20) & 1,
+        }
+
+    lon = (v >> 79) & 0xFFFFFFF
+    lat = (v >> 52) & 0x7FFFFFF
+    if lon == LON_NOT_AVAILABLE or lat == LAT_NOT_AVAILABLE:
+        return {"msg_type": msg_type, "mmsi": (v >> 130) & 0x3FFFFFFF}
+    turn = (v >> 118) & 0xFF
+    return {
+        "msg_type": msg_type,
+        "mmsi": (v >> 130) & 0x3FFFFFFF,
+        "status": (v >> 126) & 0xF,
+        "turn": to_turn((turn ^ 0x80) - 0x80),
+        "speed": to_speed((v >> 108) & 0x3FF),
+        "accuracy": (v >> 107) & 1,
+        "lon": to_lat_lon((lon ^ 0x8000000) - 0x8000000),
+        "lat": to_lat_lon((lat ^ 0x4000000) - 0x4000000),
+        "course": to_10th((v >> 40) & 0xFFF),
+        "heading": (v >> 31) & 0x1FF,
+        "raim": (v >> 19) & 1,
+    }
+
+
+def _fields(data: dict, getter: itemgetter, keys: tuple) -> tuple:
+    """Return getter(data), with None for any of keys the message lacks."""
+    try:
+        return getter(data)
+    except KeyError:
+        return tuple(map(data.get, keys))
+
+
+def _decode_message(sentences: list):
+    """
+    Decode one complete message with pyais.
+
+    Returns the message dict, or (stat, error) if decoding failed. Module
+    level so it can run in a ProcessPoolExecutor worker.
+    """
+    try:
+        if len(sentences) == 1:
+            # Class A/B position reports are most of the traffic
+            data = _decode_position(sentences[0])
+            if data is not None:
+                return data
+            msg = decode(sentences[0])
+        else:
+            msg = decode(*sentences)
+        return msg.asdict()
+    except InvalidNMEAMessageException as e:
+        return ("invalid_nmea", f"Invalid NMEA: {e}")
+    except Exception as e:
+        return ("decode_error", f"Decode error: {e}")
+
 
 class MultiPartBuffer:
     """Buffer for assembling multi-part AIS messages."""
@@ -66,22 +314,37 @@ class MultiPartBuffer:
         self.buffer: dict = {}
         self.timestamps: dict = {}
         self.timeout = timeout_seconds
+        # (first_seen, key) in expiry order; entries for keys that completed
+        # or were re-created are skipped when popped
+        self._expiry_heap: list = []
 
-    def add(self, nmea: str, raw_id: int, timestamp: str) -> Optional[tuple]:
+    def add(self, nmea: bytes, raw_id: int, timestamp: str) -> Optional[tuple]:
         """
         Add a sentence to the buffer.
 
         Returns (sentences, raw_ids, timestamp) if message is complete, None otherwise.
         """
         try:
-            parts = nmea.split(",")
-            if len(parts) < 7:
+            # Only header fields 1-4 are needed, so find their commas rather
+            # than splitting the whole sentence. Sentences have >= 7 fields.
+            if nmea.count(b",") < 6:
                 return None
+            c1 = nmea.find(b",")
+            c2 = nmea.find(b",", c1 + 1)
+            c3 = nmea.find(b",", c2 + 1)
+
+            # Nearly all traffic is "1,1": skip the int parsing and the
+            # buffer bookkeeping below
+            if nmea[c1 + 1 : c2] == b"1" and nmea[c2 + 1 : c3] == b"1":
+                return ([nmea], [raw_id], timestamp)
+
+            c4 = nmea.find(b",", c3 + 1)
+            c5 = nmea.find(b",", c4 + 1)
 
-            total = int(parts[1])
-            seq_num = int(parts[2])
-            seq_id = parts[3]
-            channel = parts[4]
+            total = int(nmea[c1 + 1 : c2])
+            seq_num = int(nmea[c2 + 1 : c3])
+            seq_id = nmea[c3 + 1 : c4]
+            channel = nmea[c4 + 1 : c5]
 
             if total == 1:
                 return ([nmea], [raw_id], timestamp)
@@ -92,23 +355,21 @@ class MultiPartBuffer:
             # Clean up old incomplete messages
             self._cleanup(now)
 
-            if key not in self.buffer:
-                self.buffer[key] = {}
+            parts = self.buffer.get(key)
+            if parts is None:
+                parts = self.buffer[key] = {}
                 self.timestamps[key] = now
+                heapq.heappush(self._expiry_heap, (now, key))
 
-            self.buffer[key][seq_num] = (nmea, raw_id, timestamp)
+            parts[seq_num] = (nmea, raw_id, timestamp)
 
-            if len(self.buffer[key]) == total:
-                sentences = []
-                raw_ids = []
-                ts = timestamp
-                for i in range(1, total + 1):
-                    s, rid, t = self.buffer[key][i]
-                    sentences.append(s)
-                    raw_ids.append(rid)
+            if len(parts) == total:
+                ordered = [parts[i] for i in range(1, total + 1)]
                 del self.buffer[key]
                 del self.timestamps[key]
-                return (sentences, raw_ids, ts)
+                sentences = [part[0] for part in ordered]
+                raw_ids = [part[1] for part in ordered]
+                return (sentences, raw_ids, timestamp)
 
             return None
 
@@ -117,10 +378,12 @@ class MultiPartBuffer:
 
     def _cleanup(self, now: float):
         """Remove incomplete messages older than timeout."""
-        expired = [k for k, t in self.timestamps.items() if now - t > self.timeout]
-        for k in expired:
-            del self.buffer[k]
-            del self.timestamps[k]
+        heap = self._expiry_heap
+        while heap and now - heap[0][0] > self.timeout:
+            t, k = heapq.heappop(heap)
+            if self.timestamps.get(k) == t:
+                del self.buffer[k]
+                del self.timestamps[k]
 
     def get_incomplete(self) -> list:
         """Get raw_ids of incomplete multi-part messages (for error marking)."""
@@ -134,11 +397,68 @@ class MultiPartBuffer:
 class AISDecoder:
     """Decodes AIS messages and stores in database."""
 
-    def __init__(self, db_path: Path, batch_size: int = DEFAULT_BATCH_SIZE):
+    def __init__(
+        self, db_path: Path, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1
+    ):
         self.db_path = db_path
         self.batch_size = batch_size
         self.buffer = MultiPartBuffer()
         self.stats = defaultdict(int)
+        # Messages seen per type, indexed by the 6-bit msg_type field
+        self.type_counts = array("q", [0] * 64)
+
+        # msg_type -> _store_* handler, all taking (raw_id, timestamp, data)
+        self._dispatch = (
+            {t: self._store_position for t in POSITION_TYPES}
+            | {t: self._store_vessel for t in STATIC_TYPES}
+            | {t: self._store_base_station for t in BASE_STATION_TYPES}
+            | {t: self._store_nav_aid for t in NAV_AID_TYPES}
+            | {t: self._store_binary_message for t in BINARY_TYPES}
+            | {t: self._store_safety_message for t in SAFETY_TYPES}
+        )
+        # Type 19 also has static data (extended Class B CS)
+        self._dispatch[19] = self._store_extended_position
+
+        # pyais is pure Python; more than one worker decodes in subprocesses
+        workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+        # One connection for the decoder's lifetime keeps the page cache warm
+        # Autocommit: _write_batch opens and ends each batch's transaction
+        # itself, so sqlite3 never begins or commits one implicitly
+        self.conn = sqlite3.connect(str(db_path), isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")       # Wait out capture/web locks
+        self.conn.execute("PRAGMA cache_size=-262144")      # 256 MB page cache
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=30000000000")   # Capped by SQLITE_MAX_MMAP_SIZE
+        self.conn.execute("PRAGMA wal_autocheckpoint=10000")
+        self.conn.row_factory = sqlite3.Row
+
+    def close(self):
+        """Close the database connection and decode workers."""
+        self.conn.close()
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def drop_indexes(self, table: str) -> list:
+        """Drop a table's secondary indexes and return their CREATE statements."""
+        rows = self.conn.execute(
+            """
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL
+            """,
+            (table,),
+        ).fetchall()
+        for name, _ in rows:
+            self.conn.execute(f'DROP INDEX "{name}"')
+        return [sql for _, sql in rows]
+
+    def create_indexes(self, statements: list):
+        """Recreate indexes returned by drop_indexes()."""
+        for sql in statements:
+            self.conn.execute(sql)
 
     def process_batch(self) -> int:
         """
@@ -146,268 +466,318 @@ class AISDecoder:
 
         Returns number of messages processed.
         """
-        conn = sqlite3.connect(str(self.db_path))
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.row_factory = sqlite3.Row
+        batch = self._decode_batch(self._fetch_pending(self.conn))
+
+        if batch is None:
+            return 0
+
+        self._write_batch(batch)
 
-        # Get pending messages
+        return batch[0]
+
+    def process_pipelined(self, on_batch=None) -> int:
+        """
+        Process pending messages, decoding on a worker thread.
+
+        The worker fetches and decodes the next batch while this thread
+        writes and commits the previous one, so commit latency overlaps
+        with decoding. Stops where repeated process_batch() calls would:
+        after the first batch that processes nothing. on_batch(total) is
+        called after each commit.
+
+        Returns total number of messages processed.
+        """
+        batches = queue.Queue(maxsize=2)
+        stop = threading.Event()
+
+        def produce():
+            conn = sqlite3.connect(str(self.db_path))
+            conn.row_factory = sqlite3.Row
+            try:
+                # Earlier batches may not be committed yet, so page by id
+                last_id = 0
+                while not stop.is_set():
+                    batch = self._decode_batch(self._fetch_pending(conn, last_id))
+                    if batch is None:
+                        break
+                    last_id = batch[-1]
+                    batches.put(batch)
+                    if batch[0] == 0:
+                        break
+                batches.put(None)
+            except BaseException as e:
+                batches.put(e)
+            finally:
+                conn.close()
+
+        worker = threading.Thread(target=produce, name="decode", daemon=True)
+        worker.start()
+
+        total = 0
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                if isinstance(batch, BaseException):
+                    raise batch
+                self._write_batch(batch)
+                total += batch[0]
+                if on_batch is not None and batch[0]:
+                    on_batch(total)
+        finally:
+            stop.set()
+            # Unblock a worker waiting on a full queue
+            while worker.is_alive():
+                try:
+                    batches.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+        return total
+
+    def _fetch_pending(
+        self, conn: sqlite3.Connection, after_id: int = 0
+    ) -> sqlite3.Cursor:
+        """
+        Query the next batch of pending messages with id > after_id.
+
+        Returns the open cursor; rows are streamed as it is iterated. Reads
+        through migrate.py's partial idx_raw_pending, which holds only
+        undecoded rows.
+        """
         cursor = conn.execute(
             """
             SELECT id, timestamp, nmea
-            FROM raw_messages
-            WHERE decoded = 0
+            FROM raw_messages INDEXED BY idx_raw_pending
+            WHERE decoded = 0 AND id > ?
             ORDER BY id
             LIMIT ?
             """,
-            (self.batch_size,),
+            (after_id, self.batch_size),
         )
-        rows = cursor.fetchall()
+        return cursor
 
-        if not rows:
-            conn.close()
-            return 0
+    def _decode_batch(self, rows) -> Optional[tuple]:
+        """
+        Decode rows from a _fetch_pending() cursor without writing.
 
-        processed = 0
+        Returns (processed, partial_ids, ok_ids, err_rows, vessels, rows,
+        first_id, last_id) where vessels and rows are the queued writes (see
+        _vessel_row and _defer) and first_id..last_id is the range of ids read,
+        or None if there were no rows. ok_ids only holds ids before first_id;
+        the rest of the range is marked decoded as a whole by _write_batch.
+        """
+        # Rows queued by the _store_* methods, flushed by _write_batch
+        self._vessels = {}
+        self._rows = defaultdict(list)
+
+        # Status updates are collected per outcome and written with one
+        # executemany each at the end of the batch.
+        partial_ids = []
+        ok_ids = []
+        err_rows = []
+
+        # Assemble first (the buffer is stateful), then decode
+        complete = []
+        first_id = raw_id = None
         for row in rows:
             raw_id = row["id"]
+            if first_id is None:
+                first_id = raw_id
             timestamp = row["timestamp"]
             nmea = row["nmea"]
+            if isinstance(nmea, str):
+                # Capture stores sentences as BLOBs; older rows are TEXT.
+                # pyais encodes str input as UTF-8 itself.
+                nmea = nmea.encode()
+            elif not nmea.isascii():
+                nmea = nmea.decode("ascii", "ignore").encode()
 
             result = self.buffer.add(nmea, raw_id, timestamp)
 
             if result is None:
                 # Part of multi-part message, not complete yet
                 # Mark as processed so we don't re-fetch, will be handled when complete
-                conn.execute(
-                    "UPDATE raw_messages SET decoded = 2 WHERE id = ?",
-                    (raw_id,),
-                )
+                partial_ids.append((raw_id,))
                 continue
 
-            sentences, raw_ids, ts = result
-            success, error = self._decode_and_store(conn, sentences, raw_ids, ts)
+            complete.append(result)
+
+        if raw_id is None:
+            return None
+
+        sentence_lists = [sentences for sentences, _, _ in complete]
+        if self.pool is not None:
+            decoded = self.pool.map(_decode_message, sentence_lists, chunksize=64)
+        else:
+            decoded = map(_decode_message, sentence_lists)
+
+        processed = 0
+        for (_, raw_ids, ts), data in zip(complete, decoded):
+            success, error = self._store_decoded(data, raw_ids, ts)
 
             # Mark all parts as decoded
-            for rid in raw_ids:
-                if success:
-                    conn.execute(
-                        "UPDATE raw_messages SET decoded = 1 WHERE id = ?",
-                        (rid,),
-                    )
-                else:
-                    conn.execute(
-                        "UPDATE raw_messages SET decoded = -1, decode_error = ? WHERE id = ?",
-                        (error, rid),
-                    )
+            if success:
+                ok_ids.extend((rid,) for rid in raw_ids)
+            else:
+                err_rows.extend((error, rid) for rid in raw_ids)
 
             processed += len(raw_ids)
 
         # Handle incomplete multi-part messages that timed out
         incomplete = self.buffer.get_incomplete()
         for rid in incomplete:
-            conn.execute(
+            err_rows.append(("Incomplete multi-part message (timeout)", rid))
+            self.stats["incomplete"] += 1
+
+        # Every raw_messages update rewrites the row's page, so skip the
+        # partial mark for parts that get their final status in this batch
+        if partial_ids:
+            final = {rid for rid, in ok_ids}
+            final.update(rid for _, rid in err_rows)
+            partial_ids = [row for row in partial_ids if row[0] not in final]
+
+        # Parts buffered by earlier batches still need their own update
+        ok_ids = [row for row in ok_ids if row[0] < first_id]
+
+        return (
+            processed,
+            partial_ids,
+            ok_ids,
+            err_rows,
+            list(self._vessels.values()),
+            self._rows,
+            first_id,
+            raw_id,
+        )
+
+    def _write_batch(self, batch: tuple):
+        """Write a decoded batch in one transaction."""
+        _, partial_ids, ok_ids, err_rows, vessels, rows, first_id, last_id = batch
+        conn = self.conn
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(UPSERT_VESSEL_SQL, vessels)
+            if INSERT_POSITION_SQL in rows:
+                (last_position,) = conn.execute(
+                    "SELECT IFNULL(MAX(id), 0) FROM positions"
+                ).fetchone()
+            for sql, params in rows.items():
+                conn.executemany(sql, params)
+            # After the vessel upserts, so each vessel's final static data
+            # for the batch is joined in
+            if INSERT_POSITION_SQL in rows:
+                conn.execute(REFRESH_LATEST_SQL, (last_position,))
+            conn.executemany(
+                "UPDATE raw_messages SET decoded = 2 WHERE id = ?", partial_ids
+            )
+            conn.executemany(
                 "UPDATE raw_messages SET decoded = -1, decode_error = ? WHERE id = ?",
-                ("Incomplete multi-part message (timeout)", rid),
+                err_rows,
             )
-            self.stats["incomplete"] += 1
+            conn.executemany("UPDATE raw_messages SET decoded = 1 WHERE id = ?", ok_ids)
+            # Every row read is partial, failed or decoded, and the first two
+            # are marked above, so what is still pending in the range decoded
+            # cleanly: one range update instead of one statement per row
+            conn.execute(
+                "UPDATE raw_messages SET decoded = 1"
+                " WHERE decoded = 0 AND id BETWEEN ? AND ?",
+                (first_id, last_id),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
 
-        conn.commit()
-        conn.close()
+    def _defer(self, sql: str, row: tuple):
+        """Queue an insert; each statement's rows keep batch order."""
+        self._rows[sql].append(row)
 
-        return processed
+    def _vessel_row(self, mmsi: int, timestamp: str) -> list:
+        """
+        Return the batch's UPSERT_VESSEL_SQL row for mmsi, counting a message.
 
-    def _decode_and_store(
-        self, conn: sqlite3.Connection, sentences: list, raw_ids: list, timestamp: str
+        Every static report and position for a vessel in the batch merges
+        into one row: later non-NULL fields win, first_seen is the first
+        message's timestamp and last_seen the latest's, and the counts add
+        up, which is what one upsert per message would leave.
+        """
+        row = self._vessels.get(mmsi)
+        if row is None:
+            row = [mmsi] + [None] * (len(VESSEL_KEYS) - 1) + [timestamp, None, 0, 0]
+            self._vessels[mmsi] = row
+        row[-3] = timestamp
+        return row
+
+    def _store_decoded(
+        self, data, raw_ids: list, timestamp: str
     ) -> tuple[bool, Optional[str]]:
-        """Decode sentences and store in appropriate table."""
-        try:
-            if len(sentences) == 1:
-                msg = decode(sentences[0])
-            else:
-                msg = decode(*sentences)
+        """Store a _decode_message() result in the appropriate table."""
+        if isinstance(data, tuple):
+            stat, error = data
+            self.stats[stat] += 1
+            return False, error
 
-            data = msg.asdict()
+        try:
             msg_type = data.get("msg_type")
             mmsi = data.get("mmsi")
 
             if msg_type is None or mmsi is None:
                 return False, "Missing msg_type or mmsi"
 
-            self.stats[f"type_{msg_type}"] += 1
+            self.type_counts[msg_type] += 1
 
             # Route to appropriate table
-            if msg_type in POSITION_TYPES:
-                self._store_position(conn, raw_ids[0], timestamp, data)
-                # Type 19 also has static data (extended Class B CS)
-                if msg_type == 19:
-                    self._store_type19_static(conn, timestamp, data)
-            elif msg_type in STATIC_TYPES:
-                self._store_vessel(conn, timestamp, data)
-            elif msg_type in BASE_STATION_TYPES:
-                self._store_base_station(conn, raw_ids[0], timestamp, data)
-            elif msg_type in NAV_AID_TYPES:
-                self._store_nav_aid(conn, raw_ids[0], timestamp, data)
-            elif msg_type in BINARY_TYPES:
-                self._store_binary_message(conn, raw_ids[0], timestamp, data)
-            elif msg_type in SAFETY_TYPES:
-                self._store_safety_message(conn, raw_ids[0], timestamp, data)
+            handler = self._dispatch.get(msg_type)
+            if handler is not None:
+                handler(raw_ids[0], timestamp, data)
             else:
                 # Other message types - just mark as decoded, no storage
                 self.stats["other"] += 1
 
             return True, None
 
-        except InvalidNMEAMessageException as e:
-            self.stats["invalid_nmea"] += 1
-            return False, f"Invalid NMEA: {e}"
         except Exception as e:
             self.stats["decode_error"] += 1
             return False, f"Decode error: {e}"
 
-    def _store_position(
-        self, conn: sqlite3.Connection, raw_id: int, timestamp: str, data: dict
-    ):
+    def _store_position(self, raw_id: int, timestamp: str, data: dict):
         """Store position report."""
         # Skip if no valid position
         lat = data.get("lat")
         lon = data.get("lon")
         if lat is None or lon is None:
+            self.stats["no_position"] += 1
             return
         if lat == 91.0 or lon == 181.0:  # AIS "not available" values
+            self.stats["no_position"] += 1
             return
 
-        conn.execute(
-            """
-            INSERT INTO positions (
-                raw_message_id, timestamp, mmsi, msg_type,
-                lat, lon, speed, course, heading, nav_status, turn, accuracy, raim
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                raw_id,
-                timestamp,
-                data.get("mmsi"),
-                data.get("msg_type"),
-                lat,
-                lon,
-                data.get("speed"),
-                data.get("course"),
-                data.get("heading"),
-                data.get("status"),
-                data.get("turn"),
-                data.get("accuracy"),
-                data.get("raim"),
-            ),
-        )
+        if "status" in data:  # Class A and long-range
+            row = (raw_id, timestamp) + _fields(data, *POSITION_A)
+        else:
+            row = (raw_id, timestamp) + _fields(data, *POSITION_B) + (None, None)
+        self._defer(INSERT_POSITION_SQL, row)
+        self._vessel_row(row[2], timestamp)[-2] += 1
         self.stats["positions"] += 1
 
-    def _store_vessel(self, conn: sqlite3.Connection, timestamp: str, data: dict):
+    def _store_vessel(self, raw_id: int, timestamp: str, data: dict):
         """Store or update vessel static data."""
-        mmsi = data.get("mmsi")
-
         # Type 24 has two parts (A and B)
         partno = data.get("partno")
 
         if partno == 0:  # Part A - ship name
-            conn.execute(
-                """
-                INSERT INTO vessels (mmsi, shipname, first_seen, last_seen, static_count)
-                VALUES (?, ?, ?, ?, 1)
-                ON CONFLICT(mmsi) DO UPDATE SET
-                    shipname = COALESCE(excluded.shipname, shipname),
-                    last_seen = excluded.last_seen,
-                    static_count = static_count + 1
-                """,
-                (mmsi, data.get("shipname"), timestamp, timestamp),
-            )
+            self._store_static(timestamp, data, VESSEL_A)
         elif partno == 1:  # Part B - callsign, dimensions, ship type
-            conn.execute(
-                """
-                INSERT INTO vessels (
-                    mmsi, callsign, ship_type,
-                    to_bow, to_stern, to_port, to_starboard,
-                    first_seen, last_seen, static_count
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
-                ON CONFLICT(mmsi) DO UPDATE SET
-                    callsign = COALESCE(excluded.callsign, callsign),
-                    ship_type = COALESCE(excluded.ship_type, ship_type),
-                    to_bow = COALESCE(excluded.to_bow, to_bow),
-                    to_stern = COALESCE(excluded.to_stern, to_stern),
-                    to_port = COALESCE(excluded.to_port, to_port),
-                    to_starboard = COALESCE(excluded.to_starboard, to_starboard),
-                    last_seen = excluded.last_seen,
-                    static_count = static_count + 1
-                """,
-                (
-                    mmsi,
-                    data.get("callsign"),
-                    data.get("ship_type"),
-                    data.get("to_bow"),
-                    data.get("to_stern"),
-                    data.get("to_port"),
-                    data.get("to_starboard"),
-                    timestamp,
-                    timestamp,
-                ),
-            )
+            self._store_static(timestamp, data, VESSEL_B)
         else:  # Type 5 - full static data
-            conn.execute(
-                """
-                INSERT INTO vessels (
-                    mmsi, shipname, callsign, imo, ship_type, destination,
-                    eta_month, eta_day, eta_hour, eta_minute, draught,
-                    to_bow, to_stern, to_port, to_starboard,
-                    ais_version, epfd, first_seen, last_seen, static_count
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
-                ON CONFLICT(mmsi) DO UPDATE SET
-                    shipname = COALESCE(excluded.shipname, shipname),
-                    callsign = COALESCE(excluded.callsign, callsign),
-                    imo = COALESCE(excluded.imo, imo),
-                    ship_type = COALESCE(excluded.ship_type, ship_type),
-                    destination = COALESCE(excluded.destination, destination),
-                    eta_month = COALESCE(excluded.eta_month, eta_month),
-                    eta_day = COALESCE(excluded.eta_day, eta_day),
-                    eta_hour = COALESCE(excluded.eta_hour, eta_hour),
-                    eta_minute = COALESCE(excluded.eta_minute, eta_minute),
-                    draught = COALESCE(excluded.draught, draught),
-                    to_bow = COALESCE(excluded.to_bow, to_bow),
-                    to_stern = COALESCE(excluded.to_stern, to_stern),
-                    to_port = COALESCE(excluded.to_port, to_port),
-                    to_starboard = COALESCE(excluded.to_starboard, to_starboard),
-                    ais_version = COALESCE(excluded.ais_version, ais_version),
-                    epfd = COALESCE(excluded.epfd, epfd),
-                    last_seen = excluded.last_seen,
-                    static_count = static_count + 1
-                """,
-                (
-                    mmsi,
-                    data.get("shipname"),
-                    data.get("callsign"),
-                    data.get("imo"),
-                    data.get("ship_type"),
-                    data.get("destination"),
-                    data.get("month"),
-                    data.get("day"),
-                    data.get("hour"),
-                    data.get("minute"),
-                    data.get("draught"),
-                    data.get("to_bow"),
-                    data.get("to_stern"),
-                    data.get("to_port"),
-                    data.get("to_starboard"),
-                    data.get("ais_version"),
-                    data.get("epfd"),
-                    timestamp,
-                    timestamp,
-                ),
-            )
+            self._store_static(timestamp, data, VESSEL_FULL)
 
         self.stats["vessels"] += 1
 
-    def _store_base_station(
-        self, conn: sqlite3.Connection, raw_id: int, timestamp: str, data: dict
-    ):
+    def _store_base_station(self, raw_id: int, timestamp: str, data: dict):
         """Store base station report."""
         lat = data.get("lat")
         lon = data.get("lon")
@@ -416,12 +786,8 @@ class AISDecoder:
         if lat == 91.0 or lon == 181.0:
             return
 
-        conn.execute(
-            """
-            INSERT INTO base_stations (
-                raw_message_id, timestamp, mmsi, lat, lon, accuracy, epfd
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+        self._defer(
+            INSERT_BASE_STATION_SQL,
             (
                 raw_id,
                 timestamp,
@@ -434,9 +800,7 @@ class AISDecoder:
         )
         self.stats["base_stations"] += 1
 
-    def _store_nav_aid(
-        self, conn: sqlite3.Connection, raw_id: int, timestamp: str, data: dict
-    ):
+    def _store_nav_aid(self, raw_id: int, timestamp: str, data: dict):
         """Store navigation aid report."""
         lat = data.get("lat")
         lon = data.get("lon")
@@ -445,14 +809,8 @@ class AISDecoder:
         if lat == 91.0 or lon == 181.0:
             return
 
-        conn.execute(
-            """
-            INSERT INTO nav_aids (
-                raw_message_id, timestamp, mmsi, aid_type, name,
-                lat, lon, accuracy,
-                to_bow, to_stern, to_port, to_starboard, virtual_aid
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        self._defer(
+            INSERT_NAV_AID_SQL,
             (
                 raw_id,
                 timestamp,
@@ -471,9 +829,7 @@ class AISDecoder:
         )
         self.stats["nav_aids"] += 1
 
-    def _store_binary_message(
-        self, conn: sqlite3.Connection, raw_id: int, timestamp: str, data: dict
-    ):
+    def _store_binary_message(self, raw_id: int, timestamp: str, data: dict):
         """Store binary message (Types 6, 8, 25, 26)."""
         mmsi = data.get("mmsi")
         msg_type = data.get("msg_type")
@@ -499,13 +855,8 @@ class AISDecoder:
                 # Decoding failed, store raw only
                 pass
 
-        conn.execute(
-            """
-            INSERT INTO binary_messages (
-                raw_message_id, timestamp, mmsi, msg_type,
-                dest_mmsi, dac, fid, raw_data, decoded_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        self._defer(
+            INSERT_BINARY_MESSAGE_SQL,
             (
                 raw_id,
                 timestamp,
@@ -520,21 +871,15 @@ class AISDecoder:
         )
         self.stats["binary_messages"] += 1
 
-    def _store_safety_message(
-        self, conn: sqlite3.Connection, raw_id: int, timestamp: str, data: dict
-    ):
+    def _store_safety_message(self, raw_id: int, timestamp: str, data: dict):
         """Store safety-related message (Types 12, 14)."""
         mmsi = data.get("mmsi")
         msg_type = data.get("msg_type")
         dest_mmsi = data.get("dest_mmsi")  # Type 12 only (addressed)
         text = data.get("text", "")
 
-        conn.execute(
-            """
-            INSERT INTO safety_messages (
-                raw_message_id, timestamp, mmsi, msg_type, dest_mmsi, text
-            ) VALUES (?, ?, ?, ?, ?, ?)
-            """,
+        self._defer(
+            INSERT_SAFETY_MESSAGE_SQL,
             (
                 raw_id,
                 timestamp,
@@ -546,49 +891,35 @@ class AISDecoder:
         )
         self.stats["safety_messages"] += 1
 
-    def _store_type19_static(
-        self, conn: sqlite3.Connection, timestamp: str, data: dict
-    ):
-        """Extract and store static data from Type 19 (Extended Class B CS)."""
-        mmsi = data.get("mmsi")
+    def _store_extended_position(self, raw_id: int, timestamp: str, data: dict):
+        """Store Type 19 (Extended Class B CS) position and static data."""
+        self._store_position(raw_id, timestamp, data)
+        self._store_type19_static(raw_id, timestamp, data)
 
+    def _store_type19_static(self, raw_id: int, timestamp: str, data: dict):
+        """Extract and store static data from Type 19 (Extended Class B CS)."""
         # Type 19 has shipname, ship_type, and dimensions
-        conn.execute(
-            """
-            INSERT INTO vessels (
-                mmsi, shipname, ship_type,
-                to_bow, to_stern, to_port, to_starboard,
-                epfd, first_seen, last_seen, static_count
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
-            ON CONFLICT(mmsi) DO UPDATE SET
-                shipname = COALESCE(excluded.shipname, shipname),
-                ship_type = COALESCE(excluded.ship_type, ship_type),
-                to_bow = COALESCE(excluded.to_bow, to_bow),
-                to_stern = COALESCE(excluded.to_stern, to_stern),
-                to_port = COALESCE(excluded.to_port, to_port),
-                to_starboard = COALESCE(excluded.to_starboard, to_starboard),
-                epfd = COALESCE(excluded.epfd, epfd),
-                last_seen = excluded.last_seen,
-                static_count = static_count + 1
-            """,
-            (
-                mmsi,
-                data.get("shipname"),
-                data.get("ship_type"),
-                data.get("to_bow"),
-                data.get("to_stern"),
-                data.get("to_port"),
-                data.get("to_starboard"),
-                data.get("epfd"),
-                timestamp,
-                timestamp,
-            ),
-        )
+        self._store_static(timestamp, data, VESSEL_TYPE19)
+
+    def _store_static(self, timestamp: str, data: dict, kind: tuple):
+        """Merge a static report into the batch's vessels row."""
+        getter, keys = kind
+        values = _fields(data, getter, keys)
+
+        row = self._vessel_row(values[0], timestamp)
+        for slot, value in zip(VESSEL_SLOTS[keys], values):
+            if value is not None:
+                row[slot] = value
+        row[-1] += 1
 
     def print_stats(self):
         """Print decoding statistics."""
         print("\nDecoding statistics:")
-        for key, value in sorted(self.stats.items()):
+        stats = dict(self.stats)
+        for msg_type, count in enumerate(self.type_counts):
+            if count:
+                stats[f"type_{msg_type}"] = count
+        for key, value in sorted(stats.items()):
             print(f"  {key}: {value}")
 
 
@@ -609,31 +940,37 @@ def run_continuous(decoder: AISDecoder, poll_interval: float):
         print("\nStopping...")
 
     decoder.print_stats()
+    decoder.close()
     print(f"\nTotal processed: {total}")
 
 
-def run_once(decoder: AISDecoder):
+def run_once(decoder: AISDecoder, bulk: bool = False):
     """Process all pending messages and exit."""
     print("Processing all pending messages...")
 
-    total = 0
     start = time.time()
 
-    while True:
-        processed = decoder.process_batch()
-        if processed == 0:
-            break
-        total += processed
+    def progress(total: int):
         elapsed = time.time() - start
         rate = total / elapsed if elapsed > 0 else 0
         print(f"Processed {total} messages ({rate:.0f}/sec)")
 
+    # Bulk backfill: build the positions indexes once at the end instead of
+    # updating three B-trees per inserted row
+    indexes = decoder.drop_indexes("positions") if bulk else []
+    try:
+        total = decoder.process_pipelined(progress)
+    finally:
+        if indexes:
+            print("Rebuilding positions indexes...")
+            decoder.create_indexes(indexes)
+
     elapsed = time.time() - start
     decoder.print_stats()
     print(f"\nTotal: {total} messages in {elapsed:.1f}s ({total/elapsed:.0f}/sec)")
 
     # Print summary
-    conn = sqlite3.connect(str(decoder.db_path))
+    conn = decoder.conn
     print("\nDatabase summary:")
     for table in ["positions", "vessels", "base_stations", "nav_aids", "binary_messages", "safety_messages", "latest_positions"]:
         count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
@@ -647,7 +984,7 @@ def run_once(decoder: AISDecoder):
     ).fetchone()[0]
     print(f"  decode errors: {errors}")
     print(f"  still pending: {pending}")
-    conn.close()
+    decoder.close()
 
 
 def main():
@@ -665,21 +1002,32 @@ def main():
         default=DEFAULT_POLL_INTERVAL,
         help="Poll interval in seconds (continuous mode)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Decode processes (0 = one per CPU)",
+    )
     parser.add_argument(
         "--once",
         action="store_true",
         help="Process pending and exit (backfill mode)",
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="With --once: drop positions indexes and rebuild them at the end",
+    )
     args = parser.parse_args()
 
     if not args.db.exists():
         print(f"Error: Database not found: {args.db}")
         return 1
 
-    decoder = AISDecoder(args.db, args.batch_size)
+    decoder = AISDecoder(args.db, args.batch_size, args.workers)
 
     if args.once:
-        run_once(decoder)
+        run_once(decoder, args.bulk)
     else:
         run_continuous(decoder, args.poll_interval)
 
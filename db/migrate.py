@@ -6,7 +6,7 @@ Creates tables, indexes, and triggers for decoded AIS data.
 Safe to run multiple times (idempotent).
 
 Usage:
-    uv run db/migrate.py [--db path/to/ais-data.db]
+    uv run db/migrate.py [--db path/to/ais-data.db] [--force-recreate] [--vacuum]
 """
 
 import argparse
@@ -15,373 +15,382 @@ from pathlib import Path
 
 DEFAULT_DB = Path(__file__).parent / "ais-data.db"
 
+# Type-checked tables for the decoded data written on every message
+# (SQLite 3.37+): a wrongly typed value is an error instead of being stored
+STRICT = " STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else ""
+
+# Append-only tables keyed by a plain INTEGER PRIMARY KEY (the rowid). Rows
+# are never deleted, so AUTOINCREMENT's sqlite_sequence write per insert
+# buys nothing.
+LOG_TABLES = ("positions", "base_stations", "nav_aids", "binary_messages", "safety_messages")
+
+# Keeps latest_positions' copy of a vessel's static fields current, created
+# once for inserts and once for updates. Vessels' static fields only ever go
+# from NULL to a value (the decoder's upsert COALESCEs them), so copying the
+# row is the same as COALESCE(NEW.x, x) per column.
+VESSEL_TRIGGER_SQL = """
+    CREATE TRIGGER update_latest_vessel_{event}
+    AFTER {event_upper} ON vessels
+    BEGIN
+        UPDATE latest_positions SET (
+            shipname, callsign, imo, ship_type, destination,
+            draught, eta_month, eta_day, eta_hour, eta_minute,
+            to_bow, to_stern, to_port, to_starboard
+        ) = (
+            SELECT
+                shipname, callsign, imo, ship_type, destination,
+                draught, eta_month, eta_day, eta_hour, eta_minute,
+                to_bow, to_stern, to_port, to_starboard
+            FROM vessel_static_view
+            WHERE mmsi = NEW.mmsi
+        )
+        WHERE mmsi = NEW.mmsi;
+    END;
+"""
+
+# Pending-decode index on capture's raw_messages. Partial, so rows leave it
+# as they are decoded and it stays the size of the backlog, not the archive.
+CREATE_PENDING_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_raw_pending
+    ON raw_messages(id) WHERE decoded = 0
+"""
 
-def _needs_recreation(conn: sqlite3.Connection) -> bool:
+# Decoded data to drop on a schema mismatch or --force-recreate; triggers
+# first. update_vessel_position_count only exists in older schemas.
+DROP_DECODED_SQL = """
+    DROP TRIGGER IF EXISTS update_latest_position;
+    DROP TRIGGER IF EXISTS update_latest_vessel_insert;
+    DROP TRIGGER IF EXISTS update_latest_vessel_update;
+    DROP TRIGGER IF EXISTS update_vessel_position_count;
+
+    DROP TABLE IF EXISTS latest_positions;
+    DROP TABLE IF EXISTS positions;
+    DROP TABLE IF EXISTS vessels;
+    DROP TABLE IF EXISTS base_stations;
+    DROP TABLE IF EXISTS nav_aids;
+    DROP TABLE IF EXISTS binary_messages;
+    DROP TABLE IF EXISTS safety_messages;
+"""
+
+# Every table, index, view and trigger for the decoded data, run as one
+# script after the conditional steps in migrate()
+SCHEMA_SQL = f"""
+    -- Positions table - all position reports
+    CREATE TABLE IF NOT EXISTS positions (
+        id INTEGER PRIMARY KEY,
+        raw_message_id INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        mmsi INTEGER NOT NULL,
+        msg_type INTEGER NOT NULL,
+        lat REAL NOT NULL,
+        lon REAL NOT NULL,
+        speed REAL,
+        course REAL,
+        heading INTEGER,
+        nav_status INTEGER,
+        turn REAL,
+        accuracy INTEGER,
+        raim INTEGER,
+        FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
+    ){STRICT};
+    CREATE INDEX IF NOT EXISTS idx_positions_mmsi ON positions(mmsi);
+    CREATE INDEX IF NOT EXISTS idx_positions_timestamp ON positions(timestamp);
+    -- Covers the web track and port-visit queries (timestamp, lat, lon, speed,
+    -- course per mmsi) so they read only the index. It replaces
+    -- idx_positions_mmsi_ts, its (mmsi, timestamp DESC) prefix, which older
+    -- databases still have.
+    DROP INDEX IF EXISTS idx_positions_mmsi_ts;
+    CREATE INDEX IF NOT EXISTS idx_positions_track
+    ON positions(mmsi, timestamp DESC, lat, lon, speed, course);
+
+    -- Vessels table - static data from Type 5, 24
+    CREATE TABLE IF NOT EXISTS vessels (
+        mmsi INTEGER PRIMARY KEY,
+        shipname TEXT,
+        callsign TEXT,
+        imo INTEGER,
+        ship_type INTEGER,
+        destination TEXT,
+        eta_month INTEGER,
+        eta_day INTEGER,
+        eta_hour INTEGER,
+        eta_minute INTEGER,
+        draught REAL,
+        to_bow INTEGER,
+        to_stern INTEGER,
+        to_port INTEGER,
+        to_starboard INTEGER,
+        ais_version INTEGER,
+        epfd INTEGER,
+        first_seen TEXT,
+        last_seen TEXT,
+        position_count INTEGER DEFAULT 0,
+        static_count INTEGER DEFAULT 0
+    ){STRICT};
+
+    -- Base stations table - Type 4, 11
+    CREATE TABLE IF NOT EXISTS base_stations (
+        id INTEGER PRIMARY KEY,
+        raw_message_id INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        mmsi INTEGER NOT NULL,
+        lat REAL NOT NULL,
+        lon REAL NOT NULL,
+        accuracy INTEGER,
+        epfd INTEGER,
+        FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_base_mmsi ON base_stations(mmsi);
+
+    -- Navigation aids table - Type 21
+    CREATE TABLE IF NOT EXISTS nav_aids (
+        id INTEGER PRIMARY KEY,
+        raw_message_id INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        mmsi INTEGER NOT NULL,
+        aid_type INTEGER,
+        name TEXT,
+        lat REAL NOT NULL,
+        lon REAL NOT NULL,
+        accuracy INTEGER,
+        to_bow INTEGER,
+        to_stern INTEGER,
+        to_port INTEGER,
+        to_starboard INTEGER,
+        virtual_aid INTEGER,
+        FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_nav_aids_mmsi ON nav_aids(mmsi);
+
+    -- Binary messages table - Type 6, 8, 25, 26
+    CREATE TABLE IF NOT EXISTS binary_messages (
+        id INTEGER PRIMARY KEY,
+        raw_message_id INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        mmsi INTEGER NOT NULL,
+        msg_type INTEGER NOT NULL,
+        dest_mmsi INTEGER,
+        dac INTEGER,
+        fid INTEGER,
+        raw_data TEXT,
+        decoded_json TEXT,
+        FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_binary_mmsi ON binary_messages(mmsi);
+    CREATE INDEX IF NOT EXISTS idx_binary_dac_fid ON binary_messages(dac, fid);
+    CREATE INDEX IF NOT EXISTS idx_binary_timestamp ON binary_messages(timestamp);
+
+    -- Safety messages table - Type 12, 14
+    CREATE TABLE IF NOT EXISTS safety_messages (
+        id INTEGER PRIMARY KEY,
+        raw_message_id INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        mmsi INTEGER NOT NULL,
+        msg_type INTEGER NOT NULL,
+        dest_mmsi INTEGER,
+        text TEXT,
+        FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_safety_mmsi ON safety_messages(mmsi);
+    CREATE INDEX IF NOT EXISTS idx_safety_timestamp ON safety_messages(timestamp);
+
+    -- Latest positions table - kept by the decoder and the vessels triggers
+    -- for fast UI loads
+    CREATE TABLE IF NOT EXISTS latest_positions (
+        mmsi INTEGER PRIMARY KEY,
+        raw_message_id INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        msg_type INTEGER NOT NULL,
+        lat REAL NOT NULL,
+        lon REAL NOT NULL,
+        speed REAL,
+        course REAL,
+        heading INTEGER,
+        nav_status INTEGER,
+        shipname TEXT,
+        callsign TEXT,
+        imo INTEGER,
+        ship_type INTEGER,
+        destination TEXT,
+        draught REAL,
+        eta_month INTEGER,
+        eta_day INTEGER,
+        eta_hour INTEGER,
+        eta_minute INTEGER,
+        to_bow INTEGER,
+        to_stern INTEGER,
+        to_port INTEGER,
+        to_starboard INTEGER,
+        FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
+    ){STRICT};
+
+    -- Drop existing triggers first (to allow updates). Vessels' position_count
+    -- and last_seen are kept by the decoder with one upsert per vessel per
+    -- batch, and latest_positions' position fields with one refresh per batch
+    -- from latest_positions_src; update_latest_position and
+    -- update_vessel_position_count are only dropped from older schemas.
+    DROP TRIGGER IF EXISTS update_latest_position;
+    DROP TRIGGER IF EXISTS update_latest_vessel_insert;
+    DROP TRIGGER IF EXISTS update_latest_vessel_update;
+    DROP TRIGGER IF EXISTS update_vessel_position_count;
+
+    -- A position as its latest_positions row, plus the position id. Static
+    -- fields only ever come from vessels, whose static fields are never
+    -- cleared, so the vessel's current values are what COALESCE-ing into an
+    -- older row would give.
+    DROP VIEW IF EXISTS latest_positions_src;
+    CREATE VIEW latest_positions_src AS
+    SELECT
+        p.id, p.mmsi, p.raw_message_id, p.timestamp, p.msg_type,
+        p.lat, p.lon, p.speed, p.course, p.heading, p.nav_status,
+        v.shipname, v.callsign, v.imo, v.ship_type, v.destination,
+        v.draught, v.eta_month, v.eta_day, v.eta_hour, v.eta_minute,
+        v.to_bow, v.to_stern, v.to_port, v.to_starboard
+    FROM positions p
+    LEFT JOIN vessels v ON v.mmsi = p.mmsi;
+
+    -- View of the vessel fields latest_positions carries, the one place that
+    -- column list lives for the vessels triggers below
+    DROP VIEW IF EXISTS vessel_static_view;
+    CREATE VIEW vessel_static_view AS
+    SELECT
+        mmsi, shipname, callsign, imo, ship_type, destination,
+        draught, eta_month, eta_day, eta_hour, eta_minute,
+        to_bow, to_stern, to_port, to_starboard
+    FROM vessels;
+""" + "".join(
+    VESSEL_TRIGGER_SQL.format(event=event, event_upper=event.upper())
+    for event in ("insert", "update")
+)
+
+
+def _table_sql(conn: sqlite3.Connection) -> dict:
+    """Return the CREATE TABLE text of every table, keyed by name."""
+    return dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'"))
+
+
+def _needs_recreation(schema: dict) -> bool:
     """Check if decoded tables need to be recreated due to schema mismatch."""
-    # Check positions table for required columns
-    cursor = conn.execute("PRAGMA table_info(positions)")
-    pos_columns = {row[1] for row in cursor.fetchall()}
-    if pos_columns and "accuracy" not in pos_columns:
-        return True
-
-    # Check vessels table for required columns
-    cursor = conn.execute("PRAGMA table_info(vessels)")
-    vessel_columns = {row[1] for row in cursor.fetchall()}
-    if vessel_columns and "shipname" not in vessel_columns:
-        return True
-
-    # Check latest_positions for draught column
-    cursor = conn.execute("PRAGMA table_info(latest_positions)")
-    lp_columns = {row[1] for row in cursor.fetchall()}
-    if lp_columns and "draught" not in lp_columns:
-        return True
+    # Columns added since the tables were first created
+    for name, column in (("positions", "accuracy"), ("vessels", "shipname"),
+                         ("latest_positions", "draught")):
+        if name in schema and column not in schema[name]:
+            return True
+
+    # Tables created before they were STRICT
+    if STRICT:
+        for name in ("positions", "vessels", "latest_positions"):
+            if name in schema and not schema[name].rstrip().endswith("STRICT"):
+                return True
+
+    # Log tables created with AUTOINCREMENT
+    for name in LOG_TABLES:
+        if "AUTOINCREMENT" in schema.get(name, ""):
+            return True
 
     return False
 
 
 def _drop_decoded_tables(conn: sqlite3.Connection):
     """Drop and reset decoded data tables."""
-    # Drop triggers first
-    conn.execute("DROP TRIGGER IF EXISTS update_latest_position")
-    conn.execute("DROP TRIGGER IF EXISTS update_latest_vessel_insert")
-    conn.execute("DROP TRIGGER IF EXISTS update_latest_vessel_update")
-    conn.execute("DROP TRIGGER IF EXISTS update_vessel_position_count")
-
-    # Drop tables
-    conn.execute("DROP TABLE IF EXISTS latest_positions")
-    conn.execute("DROP TABLE IF EXISTS positions")
-    conn.execute("DROP TABLE IF EXISTS vessels")
-    conn.execute("DROP TABLE IF EXISTS base_stations")
-    conn.execute("DROP TABLE IF EXISTS nav_aids")
-    conn.execute("DROP TABLE IF EXISTS binary_messages")
-    conn.execute("DROP TABLE IF EXISTS safety_messages")
-
-    # Reset decoded status so messages get reprocessed
-    conn.execute("UPDATE raw_messages SET decoded = 0, decode_error = NULL")
-    conn.commit()
-
-
-def migrate(db_path: Path, force_recreate: bool = False):
+    conn.executescript(DROP_DECODED_SQL)
+
+
+def _reset_decode_status(conn: sqlite3.Connection):
+    """
+    Mark every raw message pending again so it gets reprocessed.
+
+    Runs inside the migration's transaction, so an interrupted reset rolls
+    back along with the dropped decoded tables. idx_raw_pending is dropped
+    first: every reset row would enter it one by one, while migrate()
+    rebuilds it afterwards in a single pass.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_raw_pending")
+    # Rows still pending already have the reset values; skip rewriting them
+    conn.execute(
+        "UPDATE raw_messages SET decoded = 0, decode_error = NULL "
+        "WHERE decoded IS NOT 0"
+    )
+
+
+def migrate(db_path: Path, force_recreate: bool = False, vacuum: bool = False):
     """Run all migrations."""
     print(f"Migrating database: {db_path}")
 
-    conn = sqlite3.connect(str(db_path))
+    # Autocommit, so executescript() runs inside the BEGIN below rather than
+    # committing it first as legacy transaction control does
+    conn = sqlite3.connect(str(db_path), autocommit=True)
     conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")        # 64 MB page cache
+    conn.execute("PRAGMA mmap_size=268435456")      # 256 MB
     conn.execute("PRAGMA foreign_keys=ON")
 
-    # Get existing columns in raw_messages
-    cursor = conn.execute("PRAGMA table_info(raw_messages)")
-    existing_columns = {row[1] for row in cursor.fetchall()}
+    # Everything below runs in one transaction, committed at the end: one
+    # sync instead of one per statement, and an error leaves the schema as
+    # it was (closing without commit rolls back)
+    conn.execute("BEGIN IMMEDIATE")
+
+    # Column checks read the stored CREATE TABLE text, which ALTER TABLE
+    # ADD COLUMN keeps up to date
+    schema = _table_sql(conn)
+    raw_sql = schema.get("raw_messages", "")
 
     # Add decoded column if missing
-    if "decoded" not in existing_columns:
+    if "decoded" not in raw_sql:
         print("  Adding 'decoded' column to raw_messages...")
         conn.execute("ALTER TABLE raw_messages ADD COLUMN decoded INTEGER DEFAULT 0")
 
     # Add decode_error column if missing
-    if "decode_error" not in existing_columns:
+    if "decode_error" not in raw_sql:
         print("  Adding 'decode_error' column to raw_messages...")
         conn.execute("ALTER TABLE raw_messages ADD COLUMN decode_error TEXT")
 
-    # Create index for pending messages
-    print("  Creating indexes...")
-    conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_raw_pending
-        ON raw_messages(decoded, id)
-    """)
-
     # Check if tables need recreation (schema mismatch)
-    if force_recreate or _needs_recreation(conn):
+    reset = force_recreate or _needs_recreation(schema)
+    if reset:
         print("  Recreating decoded data tables (schema update)...")
         _drop_decoded_tables(conn)
+        print("  Resetting decode status...")
+        _reset_decode_status(conn)
 
-    # Positions table - all position reports
-    print("  Creating positions table...")
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS positions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            raw_message_id INTEGER NOT NULL,
-            timestamp TEXT NOT NULL,
-            mmsi INTEGER NOT NULL,
-            msg_type INTEGER NOT NULL,
-            lat REAL NOT NULL,
-            lon REAL NOT NULL,
-            speed REAL,
-            course REAL,
-            heading INTEGER,
-            nav_status INTEGER,
-            turn REAL,
-            accuracy INTEGER,
-            raim INTEGER,
-            FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
-        )
-    """)
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_positions_mmsi ON positions(mmsi)")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_positions_timestamp ON positions(timestamp)")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_positions_mmsi_ts ON positions(mmsi, timestamp DESC)")
-
-    # Vessels table - static data from Type 5, 24
-    print("  Creating vessels table...")
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS vessels (
-            mmsi INTEGER PRIMARY KEY,
-            shipname TEXT,
-            callsign TEXT,
-            imo INTEGER,
-            ship_type INTEGER,
-            destination TEXT,
-            eta_month INTEGER,
-            eta_day INTEGER,
-            eta_hour INTEGER,
-            eta_minute INTEGER,
-            draught REAL,
-            to_bow INTEGER,
-            to_stern INTEGER,
-            to_port INTEGER,
-            to_starboard INTEGER,
-            ais_version INTEGER,
-            epfd INTEGER,
-            first_seen TEXT,
-            last_seen TEXT,
-            position_count INTEGER DEFAULT 0,
-            static_count INTEGER DEFAULT 0
-        )
-    """)
-
-    # Base stations table - Type 4, 11
-    print("  Creating base_stations table...")
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS base_stations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            raw_message_id INTEGER NOT NULL,
-            timestamp TEXT NOT NULL,
-            mmsi INTEGER NOT NULL,
-            lat REAL NOT NULL,
-            lon REAL NOT NULL,
-            accuracy INTEGER,
-            epfd INTEGER,
-            FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
-        )
-    """)
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_base_mmsi ON base_stations(mmsi)")
-
-    # Navigation aids table - Type 21
-    print("  Creating nav_aids table...")
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS nav_aids (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            raw_message_id INTEGER NOT NULL,
-            timestamp TEXT NOT NULL,
-            mmsi INTEGER NOT NULL,
-            aid_type INTEGER,
-            name TEXT,
-            lat REAL NOT NULL,
-            lon REAL NOT NULL,
-            accuracy INTEGER,
-            to_bow INTEGER,
-            to_stern INTEGER,
-            to_port INTEGER,
-            to_starboard INTEGER,
-            virtual_aid INTEGER,
-            FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
-        )
-    """)
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_nav_aids_mmsi ON nav_aids(mmsi)")
-
-    # Binary messages table - Type 6, 8, 25, 26
-    print("  Creating binary_messages table...")
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS binary_messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            raw_message_id INTEGER NOT NULL,
-            timestamp TEXT NOT NULL,
-            mmsi INTEGER NOT NULL,
-            msg_type INTEGER NOT NULL,
-            dest_mmsi INTEGER,
-            dac INTEGER,
-            fid INTEGER,
-            raw_data TEXT,
-            decoded_json TEXT,
-            FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
-        )
-    """)
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_binary_mmsi ON binary_messages(mmsi)")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_binary_dac_fid ON binary_messages(dac, fid)")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_binary_timestamp ON binary_messages(timestamp)")
-
-    # Safety messages table - Type 12, 14
-    print("  Creating safety_messages table...")
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS safety_messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            raw_message_id INTEGER NOT NULL,
-            timestamp TEXT NOT NULL,
-            mmsi INTEGER NOT NULL,
-            msg_type INTEGER NOT NULL,
-            dest_mmsi INTEGER,
-            text TEXT,
-            FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
-        )
-    """)
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_safety_mmsi ON safety_messages(mmsi)")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_safety_timestamp ON safety_messages(timestamp)")
-
-    # Latest positions table - trigger-maintained for fast UI loads
-    print("  Creating latest_positions table...")
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS latest_positions (
-            mmsi INTEGER PRIMARY KEY,
-            raw_message_id INTEGER NOT NULL,
-            timestamp TEXT NOT NULL,
-            msg_type INTEGER NOT NULL,
-            lat REAL NOT NULL,
-            lon REAL NOT NULL,
-            speed REAL,
-            course REAL,
-            heading INTEGER,
-            nav_status INTEGER,
-            shipname TEXT,
-            callsign TEXT,
-            imo INTEGER,
-            ship_type INTEGER,
-            destination TEXT,
-            draught REAL,
-            eta_month INTEGER,
-            eta_day INTEGER,
-            eta_hour INTEGER,
-            eta_minute INTEGER,
-            to_bow INTEGER,
-            to_stern INTEGER,
-            to_port INTEGER,
-            to_starboard INTEGER,
-            FOREIGN KEY (raw_message_id) REFERENCES raw_messages(id)
-        )
-    """)
-
-    # Create triggers
-    print("  Creating triggers...")
-
-    # Drop existing triggers first (to allow updates)
-    conn.execute("DROP TRIGGER IF EXISTS update_latest_position")
-    conn.execute("DROP TRIGGER IF EXISTS update_latest_vessel_insert")
-    conn.execute("DROP TRIGGER IF EXISTS update_latest_vessel_update")
-    conn.execute("DROP TRIGGER IF EXISTS update_vessel_position_count")
-
-    # Trigger: Update latest_positions when new position inserted
-    conn.execute("""
-        CREATE TRIGGER update_latest_position
-        AFTER INSERT ON positions
-        BEGIN
-            INSERT INTO latest_positions (
-                mmsi, raw_message_id, timestamp, msg_type, lat, lon,
-                speed, course, heading, nav_status,
-                shipname, callsign, imo, ship_type, destination,
-                draught, eta_month, eta_day, eta_hour, eta_minute,
-                to_bow, to_stern, to_port, to_starboard
-            )
-            SELECT
-                NEW.mmsi, NEW.raw_message_id, NEW.timestamp, NEW.msg_type,
-                NEW.lat, NEW.lon, NEW.speed, NEW.course, NEW.heading, NEW.nav_status,
-                v.shipname, v.callsign, v.imo, v.ship_type, v.destination,
-                v.draught, v.eta_month, v.eta_day, v.eta_hour, v.eta_minute,
-                v.to_bow, v.to_stern, v.to_port, v.to_starboard
-            FROM (SELECT 1) AS dummy
-            LEFT JOIN vessels v ON v.mmsi = NEW.mmsi
-            ON CONFLICT(mmsi) DO UPDATE SET
-                raw_message_id = excluded.raw_message_id,
-                timestamp = excluded.timestamp,
-                msg_type = excluded.msg_type,
-                lat = excluded.lat,
-                lon = excluded.lon,
-                speed = excluded.speed,
-                course = excluded.course,
-                heading = excluded.heading,
-                nav_status = excluded.nav_status,
-                shipname = COALESCE(excluded.shipname, latest_positions.shipname),
-                callsign = COALESCE(excluded.callsign, latest_positions.callsign),
-                imo = COALESCE(excluded.imo, latest_positions.imo),
-                ship_type = COALESCE(excluded.ship_type, latest_positions.ship_type),
-                destination = COALESCE(excluded.destination, latest_positions.destination),
-                draught = COALESCE(excluded.draught, latest_positions.draught),
-                eta_month = COALESCE(excluded.eta_month, latest_positions.eta_month),
-                eta_day = COALESCE(excluded.eta_day, latest_positions.eta_day),
-                eta_hour = COALESCE(excluded.eta_hour, latest_positions.eta_hour),
-                eta_minute = COALESCE(excluded.eta_minute, latest_positions.eta_minute),
-                to_bow = COALESCE(excluded.to_bow, latest_positions.to_bow),
-                to_stern = COALESCE(excluded.to_stern, latest_positions.to_stern),
-                to_port = COALESCE(excluded.to_port, latest_positions.to_port),
-                to_starboard = COALESCE(excluded.to_starboard, latest_positions.to_starboard);
-        END
-    """)
-
-    # Trigger: Update latest_positions when vessel static data inserted
-    conn.execute("""
-        CREATE TRIGGER update_latest_vessel_insert
-        AFTER INSERT ON vessels
-        BEGIN
-            UPDATE latest_positions SET
-                shipname = COALESCE(NEW.shipname, shipname),
-                callsign = COALESCE(NEW.callsign, callsign),
-                imo = COALESCE(NEW.imo, imo),
-                ship_type = COALESCE(NEW.ship_type, ship_type),
-                destination = COALESCE(NEW.destination, destination),
-                draught = COALESCE(NEW.draught, draught),
-                eta_month = COALESCE(NEW.eta_month, eta_month),
-                eta_day = COALESCE(NEW.eta_day, eta_day),
-                eta_hour = COALESCE(NEW.eta_hour, eta_hour),
-                eta_minute = COALESCE(NEW.eta_minute, eta_minute),
-                to_bow = COALESCE(NEW.to_bow, to_bow),
-                to_stern = COALESCE(NEW.to_stern, to_stern),
-                to_port = COALESCE(NEW.to_port, to_port),
-                to_starboard = COALESCE(NEW.to_starboard, to_starboard)
-            WHERE mmsi = NEW.mmsi;
-        END
-    """)
-
-    # Trigger: Update latest_positions when vessel static data updated
-    conn.execute("""
-        CREATE TRIGGER update_latest_vessel_update
-        AFTER UPDATE ON vessels
-        BEGIN
-            UPDATE latest_positions SET
-                shipname = COALESCE(NEW.shipname, shipname),
-                callsign = COALESCE(NEW.callsign, callsign),
-                imo = COALESCE(NEW.imo, imo),
-                ship_type = COALESCE(NEW.ship_type, ship_type),
-                destination = COALESCE(NEW.destination, destination),
-                draught = COALESCE(NEW.draught, draught),
-                eta_month = COALESCE(NEW.eta_month, eta_month),
-                eta_day = COALESCE(NEW.eta_day, eta_day),
-                eta_hour = COALESCE(NEW.eta_hour, eta_hour),
-                eta_minute = COALESCE(NEW.eta_minute, eta_minute),
-                to_bow = COALESCE(NEW.to_bow, to_bow),
-                to_stern = COALESCE(NEW.to_stern, to_stern),
-                to_port = COALESCE(NEW.to_port, to_port),
-                to_starboard = COALESCE(NEW.to_starboard, to_starboard)
-            WHERE mmsi = NEW.mmsi;
-        END
-    """)
-
-    # Trigger: Update vessel position count
-    conn.execute("""
-        CREATE TRIGGER update_vessel_position_count
-        AFTER INSERT ON positions
-        BEGIN
-            INSERT INTO vessels (mmsi, first_seen, last_seen, position_count)
-            VALUES (NEW.mmsi, NEW.timestamp, NEW.timestamp, 1)
-            ON CONFLICT(mmsi) DO UPDATE SET
-                last_seen = NEW.timestamp,
-                position_count = position_count + 1;
-        END
-    """)
-
-    conn.commit()
+    # Create index for pending messages, replacing older forms
+    print("  Creating indexes...")
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_raw_pending'"
+    ).fetchone()
+    if row and "WHERE" not in row[0]:
+        conn.execute("DROP INDEX idx_raw_pending")  # Full (decoded, id) form
+    conn.execute("DROP INDEX IF EXISTS idx_raw_undecoded")  # Older decoder's copy
+    conn.execute(CREATE_PENDING_INDEX_SQL)
+    conn.execute("ANALYZE idx_raw_pending")
+
+    print("  Creating tables, indexes and triggers...")
+    conn.executescript(SCHEMA_SQL)
+
+    # Planner statistics, so first queries get the steady-state plans. The
+    # limit keeps ANALYZE to a sample of each index on large tables.
+    conn.execute("PRAGMA analysis_limit=400")
+    conn.execute("ANALYZE positions")
+    conn.execute("ANALYZE vessels")
+    conn.execute("ANALYZE latest_positions")
+    conn.execute("PRAGMA optimize")
+
+    conn.execute("COMMIT")
+
+    if vacuum:
+        # Hands free pages (e.g. from dropped decoded tables) back to the
+        # filesystem; a no-op unless the database uses incremental auto_vacuum
+        print("  Reclaiming free pages...")
+        conn.execute("PRAGMA incremental_vacuum").fetchall()  # Steps once per page
     conn.close()
 
     print("Migration complete!")
 
     # Print summary
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
     tables = conn.execute(
         "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
     ).fetchall()
@@ -393,7 +402,9 @@ def migrate(db_path: Path, force_recreate: bool = False):
     print(f"Triggers: {', '.join(t[0] for t in triggers)}")
 
     raw_count = conn.execute("SELECT COUNT(*) FROM raw_messages").fetchone()[0]
-    pending = conn.execute("SELECT COUNT(*) FROM raw_messages WHERE decoded = 0").fetchone()[0]
+    pending = conn.execute(
+        "SELECT COUNT(*) FROM raw_messages INDEXED BY idx_raw_pending WHERE decoded = 0"
+    ).fetchone()[0]
     print(f"\nraw_messages: {raw_count} total, {pending} pending decode")
 
     conn.close()
@@ -407,13 +418,18 @@ def main():
         action="store_true",
         help="Force recreation of decoded tables (resets decode status)",
     )
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="Return free pages to the filesystem (incremental auto_vacuum databases)",
+    )
     args = parser.parse_args()
 
     if not args.db.exists():
         print(f"Error: Database not found: {args.db}")
         return 1
 
-    migrate(args.db, args.force_recreate)
+    migrate(args.db, args.force_recreate, args.vacuum)
     return 0
 
 
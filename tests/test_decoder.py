@@ -0,0 +1,256 @@
+"""
+Tests for the raw_messages decoder (db/decoder.py).
+
+Sentences are built with pyais' encoder, queued in raw_messages as capture
+would store them, and decoded through a migrated database.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+from pyais.encode import encode_dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "db"))
+
+from decoder import AISDecoder  # noqa: E402
+from migrate import migrate  # noqa: E402
+
+MMSI = 211000001
+OTHER_MMSI = 211000002
+
+STATIC = {
+    "type": 5, "mmsi": MMSI, "shipname": "NORDLICHT", "callsign": "DABC",
+    "imo": 9123456, "ship_type": 70, "destination": "KIEL", "draught": 6.5,
+    "to_bow": 100, "to_stern": 20, "to_port": 10, "to_starboard": 10,
+}
+
+
+def ts(second: int) -> str:
+    return f"2026-01-01T00:00:{second:02d}+00:00"
+
+
+def position(mmsi: int, lat: float, lon: float = 10.25) -> bytes:
+    """A single-sentence Type 1 report."""
+    fields = {"type": 1, "mmsi": mmsi, "lat": lat, "lon": lon, "status": 0}
+    return encode_dict(fields)[0].encode()
+
+
+def static(seq_id: int = 0) -> list:
+    """The two sentences of a Type 5 report for MMSI."""
+    return [s.encode() for s in encode_dict(STATIC, seq_id=seq_id)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A migrated database with capture's raw_messages table."""
+    path = tmp_path / "ais-data.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE raw_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            nmea BLOB NOT NULL
+        )
+        """
+    )
+    conn.commit()
+    conn.close()
+    migrate(path)
+    return path
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
+
+
+def queue(conn, *rows) -> list:
+    """Store (timestamp, nmea) rows as raw_messages and return their ids."""
+    ids = []
+    for timestamp, nmea in rows:
+        cursor = conn.execute(
+            "INSERT INTO raw_messages (timestamp, nmea) VALUES (?, ?)",
+            (timestamp, nmea),
+        )
+        ids.append(cursor.lastrowid)
+    conn.commit()
+    return ids
+
+
+def decode_batches(db_path, batch_size: int = 1000):
+    """An AISDecoder for db_path; each next() decodes one batch."""
+    decoder = AISDecoder(db_path, batch_size=batch_size)
+    try:
+        while True:
+            yield decoder.process_batch()
+    finally:
+        decoder.close()
+
+
+def decode_all(db_path):
+    batches = decode_batches(db_path)
+    next(batches)
+    batches.close()
+
+
+def statuses(conn, ids) -> list:
+    return [
+        conn.execute("SELECT decoded FROM raw_messages WHERE id = ?", (i,)).fetchone()[0]
+        for i in ids
+    ]
+
+
+class TestPositions:
+    """Test position reports stored in positions and latest_positions."""
+
+    def test_long_range_keeps_nav_status(self, db_path, conn):
+        # Type 27, status 2 (not under command); no heading or turn
+        queue(conn, (ts(0), b"!AIVDM,1,1,,B,KC5E2b@U19PFdLbL,0*76"))
+        decode_all(db_path)
+        for table in ("positions", "latest_positions"):
+            assert conn.execute(
+                f"SELECT mmsi, msg_type, nav_status, heading FROM {table}"
+            ).fetchall() == [(206914217, 27, 2, None)]
+        assert conn.execute("SELECT turn FROM positions").fetchall() == [(None,)]
+
+    def test_class_b_has_no_nav_status(self, db_path, conn):
+        queue(conn, (ts(0), b"!AIVDM,1,1,,B,B5NJ;PP005l4ot5Isbl03wsUkP06,0*76"))
+        decode_all(db_path)
+        assert conn.execute(
+            "SELECT msg_type, nav_status, turn FROM positions"
+        ).fetchall() == [(18, None, None)]
+
+
+class TestDecodeStatus:
+    """Test the decoded status each raw message ends up with."""
+
+    def test_mixed_batch_marks_only_clean_rows(self, db_path, conn):
+        ids = queue(
+            conn,
+            (ts(1), position(MMSI, 54.0)),
+            (ts(2), b"!AIVDM,1,1,,A,,0*00"),        # Empty payload
+            (ts(3), static()[0]),
+            (ts(3), static()[1]),
+            (ts(4), static(seq_id=1)[0]),          # Second part never arrives
+            (ts(5), b"not a sentence"),            # Stays partial
+            (ts(6), position(OTHER_MMSI, 55.0)),
+        )
+        decode_all(db_path)
+
+        assert statuses(conn, ids) == [1, -1, 1, 1, -1, 2, 1]
+        assert conn.execute(
+            "SELECT id FROM raw_messages WHERE decode_error IS NOT NULL ORDER BY id"
+        ).fetchall() == [(ids[1],), (ids[4],)]
+
+    def test_multipart_split_across_batches(self, db_path, conn):
+        first, second = static()
+        ids = queue(
+            conn,
+            (ts(1), position(MMSI, 54.0)),
+            (ts(2), first),
+            (ts(2), second),
+            (ts(3), position(MMSI, 54.1)),
+        )
+        batches = decode_batches(db_path, batch_size=2)
+
+        next(batches)
+        # Still buffered: not marked decoded with the rest of the batch
+        assert statuses(conn, ids[:2]) == [1, -1]
+
+        next(batches)
+        batches.close()
+        assert statuses(conn, ids) == [1, 1, 1, 1]
+        assert conn.execute("SELECT shipname FROM vessels").fetchall() == [("NORDLICHT",)]
+
+
+class TestLatestPositions:
+    """Test latest_positions after each batch's refresh."""
+
+    def assert_latest(self, conn):
+        """latest_positions holds each vessel's last inserted position."""
+        columns = [
+            d[0] for d in conn.execute("SELECT * FROM latest_positions").description
+        ]
+        expected = conn.execute(
+            f"""
+            SELECT {", ".join(columns)} FROM latest_positions_src
+            WHERE id IN (SELECT MAX(id) FROM positions GROUP BY mmsi)
+            ORDER BY mmsi
+            """
+        ).fetchall()
+        assert conn.execute(
+            "SELECT * FROM latest_positions ORDER BY mmsi"
+        ).fetchall() == expected
+
+    def test_last_position_wins(self, db_path, conn):
+        # Timestamps out of order: the last report received wins, not the
+        # latest timestamp
+        ids = queue(
+            conn,
+            (ts(10), position(MMSI, 54.0)),
+            (ts(30), position(OTHER_MMSI, 55.0)),
+            (ts(30), position(MMSI, 54.2)),
+            (ts(20), position(MMSI, 54.1)),
+            (ts(40), position(OTHER_MMSI, 55.1)),
+            (ts(5), position(MMSI, 54.3)),
+            (ts(50), static()[0]),
+            (ts(50), static()[1]),
+        )
+        batches = decode_batches(db_path, batch_size=4)
+
+        next(batches)
+        self.assert_latest(conn)
+        assert conn.execute(
+            "SELECT mmsi, raw_message_id, timestamp FROM latest_positions ORDER BY mmsi"
+        ).fetchall() == [(MMSI, ids[3], ts(20)), (OTHER_MMSI, ids[1], ts(30))]
+
+        next(batches)
+        batches.close()
+        self.assert_latest(conn)
+        assert conn.execute(
+            "SELECT mmsi, raw_message_id, timestamp, shipname FROM latest_positions"
+            " ORDER BY mmsi"
+        ).fetchall() == [
+            (MMSI, ids[5], ts(5), "NORDLICHT"),
+            (OTHER_MMSI, ids[4], ts(40), None),
+        ]
+
+
+class TestVessels:
+    """Test the vessels row merged from a vessel's reports."""
+
+    def test_counts_and_static_fields(self, db_path, conn):
+        queue(
+            conn,
+            (ts(1), position(MMSI, 54.0)),
+            (ts(2), position(MMSI, 54.1)),
+            (ts(3), static()[0]),
+            (ts(3), static()[1]),
+            (ts(4), position(MMSI, 54.2)),
+            (ts(5), position(MMSI, 54.3)),
+        )
+        query = """
+            SELECT position_count, static_count, first_seen, last_seen
+            FROM vessels WHERE mmsi = ?
+        """
+        batches = decode_batches(db_path, batch_size=4)
+
+        next(batches)
+        assert conn.execute(query, (MMSI,)).fetchone() == (2, 1, ts(1), ts(3))
+
+        next(batches)
+        batches.close()
+        assert conn.execute(query, (MMSI,)).fetchone() == (4, 1, ts(1), ts(5))
+        assert conn.execute(
+            """
+            SELECT shipname, callsign, imo, ship_type, destination, draught,
+                   to_bow, to_stern, to_port, to_starboard
+            FROM vessels WHERE mmsi = ?
+            """,
+            (MMSI,),
+        ).fetchone() == ("NORDLICHT", "DABC", 9123456, 70, "KIEL", 6.5, 100, 20, 10, 10)